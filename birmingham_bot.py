@@ -10,10 +10,12 @@ Commands:
     /help - Show available commands
 """
 
+import asyncio
+import functools
 import sys
 import os
 import logging
-import subprocess
+import time
 from datetime import datetime
 
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
@@ -34,7 +36,7 @@ except ImportError:
     print("Please create config.py based on config.example.py")
     sys.exit(1)
 
-from football_api import FootballAPIClient
+from football_api import CachingFootballAPIClient
 from telegram_bot import TelegramNotifier
 
 # Initialize scheduler
@@ -47,31 +49,144 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize API client and database
-api_client = FootballAPIClient(FOOTBALL_API_KEY, BIRMINGHAM_TEAM_ID)
+# Initialize API client (TTL-cached) and database
+api_client = CachingFootballAPIClient(FOOTBALL_API_KEY, BIRMINGHAM_TEAM_ID)
 db = get_database()
 
-# Restart flag file path
-RESTART_FLAG_FILE = "/var/services/homes/admin/scripts/birmingham-city-notifier/.restart_flag"
+# Environment variable carrying the chat to notify after an in-place restart
+RESTART_NOTIFY_ENV = "BHAM_RESTART_NOTIFY"
+
+
+# Static keyboards are immutable - build them once at import instead of
+# re-allocating button objects on every callback
+MENU_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📋 전체 정보", callback_data="all")],
+    [
+        InlineKeyboardButton("📆 향후 경기", callback_data="future"),
+        InlineKeyboardButton("📊 최근 결과", callback_data="recent")
+    ],
+    [InlineKeyboardButton("🏆 리그 순위표", callback_data="standings")],
+    [InlineKeyboardButton("🔔 알림 설정", callback_data="notifications")]
+])
+
+MORNING_HOUR_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("7시", callback_data="set_morning_hour_7"),
+        InlineKeyboardButton("8시", callback_data="set_morning_hour_8"),
+        InlineKeyboardButton("9시", callback_data="set_morning_hour_9")
+    ],
+    [
+        InlineKeyboardButton("10시", callback_data="set_morning_hour_10"),
+        InlineKeyboardButton("11시", callback_data="set_morning_hour_11")
+    ],
+    [InlineKeyboardButton("🔙 알림 설정", callback_data="notifications")]
+])
+
+REMINDER_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("5분 전", callback_data="set_reminder_5"),
+        InlineKeyboardButton("10분 전", callback_data="set_reminder_10"),
+        InlineKeyboardButton("15분 전", callback_data="set_reminder_15")
+    ],
+    [
+        InlineKeyboardButton("30분 전", callback_data="set_reminder_30"),
+        InlineKeyboardButton("60분 전", callback_data="set_reminder_60"),
+        InlineKeyboardButton("끄기", callback_data="set_reminder_0")
+    ],
+    [InlineKeyboardButton("🔙 알림 설정", callback_data="notifications")]
+])
+
+
+# Fully static reply texts, built once at import so handlers reuse the
+# same interned strings instead of re-allocating them per callback
+MSG_MAIN_MENU = "⚽ <b>Birmingham City FC</b>\n\n원하는 정보를 선택하세요:"
+MSG_NOTIFICATIONS = "<b>🔔 알림 설정</b>\n\n아래 버튼을 눌러 알림을 설정하세요."
+MSG_MORNING_HOUR_SETTINGS = "<b>🕐 아침 알림 시간 설정</b>\n\n몇 시에 아침 알림을 받을지 선택하세요."
+MSG_REMINDER_SETTINGS = "<b>⏰ 경기 알림 시간 설정</b>\n\n경기 시작 몇 분 전에 알림을 받을지 선택하세요."
+MSG_LOADING = "⏳ 정보를 가져오는 중..."
+MSG_UNKNOWN_COMMAND = "알 수 없는 명령입니다."
+
+# Templates with placeholders, rendered with the % operator
+TPL_NOTIFICATION_TOGGLED = "%s이 %s으로 변경되었습니다."
+TPL_MORNING_HOUR_SET = "<b>🔔 알림 설정</b>\n\n아침 알림 시간이 %d시로 변경되었습니다."
+TPL_REMINDER_SET = "<b>🔔 알림 설정</b>\n\n%s"
+
+
+@functools.lru_cache(maxsize=1024)
+def get_notifier(chat_id: str) -> TelegramNotifier:
+    """Get a memoized TelegramNotifier for a chat (one instance per chat)"""
+    return TelegramNotifier(TELEGRAM_BOT_TOKEN, chat_id)
+
+
+# Chats already ensured to exist in the DB this process lifetime - lets
+# handlers skip the get_or_create round-trip after first contact
+_seen_users = set()
+
+# Short-TTL cache of user settings dicts so rapid consecutive taps on the
+# settings menu don't each re-query the DB
+_user_cache = {}
+_USER_CACHE_TTL = 30  # seconds
+
+
+# Per-chat locks so a user double-pressing a data button can't fire
+# overlapping API storms, while different chats proceed in parallel
+_chat_locks = {}
+
+
+def _lock_for(chat_id: str) -> asyncio.Lock:
+    """Get or create the lock serializing API fetches for one chat"""
+    return _chat_locks.setdefault(chat_id, asyncio.Lock())
+
+
+def ensure_user(chat_id: str, username: str = None) -> None:
+    """Create the user row on first contact, then short-circuit"""
+    if chat_id not in _seen_users:
+        db.get_or_create_user(chat_id, username)
+        _seen_users.add(chat_id)
+
+
+def get_user_settings(chat_id: str):
+    """Get the user's settings, served from a short-TTL cache"""
+    entry = _user_cache.get(chat_id)
+    now = time.monotonic()
+    if entry and now - entry[0] < _USER_CACHE_TTL:
+        return entry[1]
 
+    user = db.get_or_create_user(chat_id)
+    _seen_users.add(chat_id)
+    _user_cache[chat_id] = (now, user)
+    return user
 
-def get_menu_keyboard():
-    """Create inline keyboard with menu buttons"""
-    keyboard = [
-        [InlineKeyboardButton("📋 전체 정보", callback_data="all")],
-        [
-            InlineKeyboardButton("📆 향후 경기", callback_data="future"),
-            InlineKeyboardButton("📊 최근 결과", callback_data="recent")
-        ],
-        [InlineKeyboardButton("🏆 리그 순위표", callback_data="standings")],
-        [InlineKeyboardButton("🔔 알림 설정", callback_data="notifications")]
-    ]
-    return InlineKeyboardMarkup(keyboard)
+
+def invalidate_user_settings(chat_id: str) -> None:
+    """Drop the cached settings after a toggle/update mutates them"""
+    _user_cache.pop(chat_id, None)
+
+
+# Last content rendered into each chat's menu message, so re-pressing the
+# same button doesn't trigger a no-op edit (Telegram rejects those with
+# "message is not modified" - a wasted HTTPS round-trip either way)
+_last_render = {}
+
+
+def _markup_hash(reply_markup):
+    """Hash a keyboard markup (None-safe) for change detection"""
+    return hash(reply_markup.to_json()) if reply_markup else None
+
+
+async def _safe_edit(query, text: str, parse_mode: str = None, reply_markup=None) -> None:
+    """Edit the message, skipping the call if nothing would change"""
+    chat_id = str(query.message.chat_id)
+    state = (query.message.message_id, hash(text), _markup_hash(reply_markup))
+    if _last_render.get(chat_id) == state:
+        return
+    await query.edit_message_text(text, parse_mode=parse_mode, reply_markup=reply_markup)
+    _last_render[chat_id] = state
 
 
 def get_notification_keyboard(chat_id: str):
     """Create notification settings keyboard for specific user"""
-    user = db.get_or_create_user(chat_id)
+    user = get_user_settings(chat_id)
 
     morning_text = "🔔 아침 알림: 켜짐" if user.get("morning_notification") else "🔕 아침 알림: 꺼짐"
     morning_hour = user.get("morning_notification_hour", 9)
@@ -90,51 +205,16 @@ def get_notification_keyboard(chat_id: str):
     return InlineKeyboardMarkup(keyboard)
 
 
-def get_morning_hour_keyboard():
-    """Create morning hour selection keyboard"""
-    keyboard = [
-        [
-            InlineKeyboardButton("7시", callback_data="set_morning_hour_7"),
-            InlineKeyboardButton("8시", callback_data="set_morning_hour_8"),
-            InlineKeyboardButton("9시", callback_data="set_morning_hour_9")
-        ],
-        [
-            InlineKeyboardButton("10시", callback_data="set_morning_hour_10"),
-            InlineKeyboardButton("11시", callback_data="set_morning_hour_11")
-        ],
-        [InlineKeyboardButton("🔙 알림 설정", callback_data="notifications")]
-    ]
-    return InlineKeyboardMarkup(keyboard)
-
-
-def get_reminder_keyboard():
-    """Create match reminder selection keyboard"""
-    keyboard = [
-        [
-            InlineKeyboardButton("5분 전", callback_data="set_reminder_5"),
-            InlineKeyboardButton("10분 전", callback_data="set_reminder_10"),
-            InlineKeyboardButton("15분 전", callback_data="set_reminder_15")
-        ],
-        [
-            InlineKeyboardButton("30분 전", callback_data="set_reminder_30"),
-            InlineKeyboardButton("60분 전", callback_data="set_reminder_60"),
-            InlineKeyboardButton("끄기", callback_data="set_reminder_0")
-        ],
-        [InlineKeyboardButton("🔙 알림 설정", callback_data="notifications")]
-    ]
-    return InlineKeyboardMarkup(keyboard)
-
-
 async def menu_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /menu command - show menu with buttons"""
     chat_id = str(update.effective_chat.id)
     username = update.effective_user.username
-    db.get_or_create_user(chat_id, username)
+    ensure_user(chat_id, username)
 
     await update.message.reply_text(
-        "⚽ <b>Birmingham City FC</b>\n\n원하는 정보를 선택하세요:",
+        MSG_MAIN_MENU,
         parse_mode='HTML',
-        reply_markup=get_menu_keyboard()
+        reply_markup=MENU_KEYBOARD
     )
 
 
@@ -142,211 +222,256 @@ async def update_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     """Handle /update command - fetch and send all match information"""
     chat_id = str(update.effective_chat.id)
     username = update.effective_user.username
-    db.get_or_create_user(chat_id, username)
-    logger.info(f"Received /update command from chat_id: {chat_id}")
+    ensure_user(chat_id, username)
+    logger.info("Received /update command from chat_id: %s", chat_id)
 
     loading_msg = await update.message.reply_text("⏳ 경기 정보를 가져오는 중...")
 
     try:
-        notifier = TelegramNotifier(TELEGRAM_BOT_TOKEN, chat_id)
-
-        standing = api_client.get_team_standing()
-        all_standings = api_client.get_all_standings()
-        upcoming_raw = api_client.get_upcoming_matches(days_ahead=2)
-        upcoming_matches = [api_client.format_match_info(m) for m in upcoming_raw]
-        future_raw = api_client.get_upcoming_future_matches(limit=3)
-        future_matches = [api_client.format_match_info(m) for m in future_raw]
-        recent_raw = api_client.get_recent_results(limit=5)
-        recent_results = [api_client.format_match_info(m) for m in recent_raw]
-
-        message = notifier.format_match_notification(
-            upcoming_matches, future_matches, recent_results, standing, all_standings
-        )
+        message = await _build_all_message(chat_id)
 
         await loading_msg.delete()
-        await update.message.reply_text(message, parse_mode='HTML', reply_markup=get_menu_keyboard())
+        await update.message.reply_text(message, parse_mode='HTML', reply_markup=MENU_KEYBOARD)
 
-        logger.info(f"Successfully sent match info to chat_id: {chat_id}")
+        logger.info("Successfully sent match info to chat_id: %s", chat_id)
 
     except Exception as e:
-        logger.error(f"Error fetching match data: {e}")
+        logger.error("Error fetching match data: %s", e)
         await loading_msg.edit_text(f"⚠️ 오류가 발생했습니다: {str(e)}")
 
 
-async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Handle button callbacks"""
-    query = update.callback_query
+# ============ Settings callbacks (no API calls) ============
+
+async def _show_main_menu(query, chat_id: str) -> None:
     await query.answer()
+    await _safe_edit(
+        query,
+        MSG_MAIN_MENU,
+        parse_mode='HTML',
+        reply_markup=MENU_KEYBOARD
+    )
 
-    chat_id = str(update.effective_chat.id)
-    username = update.effective_user.username
-    callback_data = query.data
-    logger.info(f"Button pressed: {callback_data} from chat_id: {chat_id}")
 
-    # Ensure user exists
-    db.get_or_create_user(chat_id, username)
+async def _show_notifications(query, chat_id: str) -> None:
+    await query.answer()
+    await _safe_edit(
+        query,
+        MSG_NOTIFICATIONS,
+        parse_mode='HTML',
+        reply_markup=get_notification_keyboard(chat_id)
+    )
 
-    try:
-        # Notification settings callbacks (no API calls needed)
-        if callback_data == "main_menu":
-            await query.edit_message_text(
-                "⚽ <b>Birmingham City FC</b>\n\n원하는 정보를 선택하세요:",
-                parse_mode='HTML',
-                reply_markup=get_menu_keyboard()
-            )
-            return
 
-        elif callback_data == "notifications":
-            message = """<b>🔔 알림 설정</b>
+async def _toggle_notification(query, chat_id: str, setting: str, label: str) -> None:
+    """Toggle a boolean notification setting and confirm to the user"""
+    new_value = db.toggle_setting(chat_id, setting)
+    invalidate_user_settings(chat_id)
+    status = "켜짐 ✅" if new_value else "꺼짐 ❌"
+
+    # Confirm via the answerCallbackQuery popup we must send anyway and
+    # refresh only the keyboard labels - both cheaper than a full
+    # editMessageText round-trip, and they can run concurrently
+    # The markup-only edit below bypasses _safe_edit, so drop the tracked
+    # state rather than let it go stale
+    _last_render.pop(chat_id, None)
+    await asyncio.gather(
+        query.answer(TPL_NOTIFICATION_TOGGLED % (label, status)),
+        query.edit_message_reply_markup(reply_markup=get_notification_keyboard(chat_id)),
+    )
 
-아래 버튼을 눌러 알림을 설정하세요."""
-            await query.edit_message_text(
-                message,
-                parse_mode='HTML',
-                reply_markup=get_notification_keyboard(chat_id)
-            )
-            return
 
-        elif callback_data == "toggle_morning":
-            new_value = db.toggle_setting(chat_id, "morning_notification")
-            status = "켜짐 ✅" if new_value else "꺼짐 ❌"
-            message = f"""<b>🔔 알림 설정</b>
-
-아침 알림이 {status}으로 변경되었습니다."""
-            await query.edit_message_text(
-                message,
-                parse_mode='HTML',
-                reply_markup=get_notification_keyboard(chat_id)
-            )
-            return
+async def _show_morning_hour_settings(query, chat_id: str) -> None:
+    await query.answer()
+    await _safe_edit(
+        query,
+        MSG_MORNING_HOUR_SETTINGS,
+        parse_mode='HTML',
+        reply_markup=MORNING_HOUR_KEYBOARD
+    )
 
-        elif callback_data == "toggle_goal":
-            new_value = db.toggle_setting(chat_id, "goal_notification")
-            status = "켜짐 ✅" if new_value else "꺼짐 ❌"
-            message = f"""<b>🔔 알림 설정</b>
-
-골 알림이 {status}으로 변경되었습니다."""
-            await query.edit_message_text(
-                message,
-                parse_mode='HTML',
-                reply_markup=get_notification_keyboard(chat_id)
-            )
-            return
 
-        elif callback_data == "toggle_lineup":
-            new_value = db.toggle_setting(chat_id, "lineup_notification")
-            status = "켜짐 ✅" if new_value else "꺼짐 ❌"
-            message = f"""<b>🔔 알림 설정</b>
-
-라인업 알림이 {status}으로 변경되었습니다."""
-            await query.edit_message_text(
-                message,
-                parse_mode='HTML',
-                reply_markup=get_notification_keyboard(chat_id)
-            )
-            return
+async def _set_morning_hour(query, chat_id: str, hour: int) -> None:
+    await query.answer()
+    db.update_morning_notification_hour(chat_id, hour)
+    invalidate_user_settings(chat_id)
+    message = TPL_MORNING_HOUR_SET % hour
+    await _safe_edit(
+        query,
+        message,
+        parse_mode='HTML',
+        reply_markup=get_notification_keyboard(chat_id)
+    )
 
-        elif callback_data == "morning_hour_settings":
-            message = """<b>🕐 아침 알림 시간 설정</b>
 
-몇 시에 아침 알림을 받을지 선택하세요."""
-            await query.edit_message_text(
-                message,
-                parse_mode='HTML',
-                reply_markup=get_morning_hour_keyboard()
-            )
-            return
+async def _show_reminder_settings(query, chat_id: str) -> None:
+    await query.answer()
+    await _safe_edit(
+        query,
+        MSG_REMINDER_SETTINGS,
+        parse_mode='HTML',
+        reply_markup=REMINDER_KEYBOARD
+    )
+
+
+async def _set_reminder(query, chat_id: str, minutes: int) -> None:
+    await query.answer()
+    db.update_match_reminder(chat_id, minutes)
+    invalidate_user_settings(chat_id)
+    if minutes == 0:
+        status_text = "경기 알림이 꺼졌습니다."
+    else:
+        status_text = f"경기 시작 {minutes}분 전에 알림을 보내드립니다."
+    message = TPL_REMINDER_SET % status_text
+    await _safe_edit(
+        query,
+        message,
+        parse_mode='HTML',
+        reply_markup=get_notification_keyboard(chat_id)
+    )
 
-        elif callback_data.startswith("set_morning_hour_"):
-            hour = int(callback_data.split("_")[3])
-            db.update_morning_notification_hour(chat_id, hour)
-            message = f"""<b>🔔 알림 설정</b>
-
-아침 알림 시간이 {hour}시로 변경되었습니다."""
-            await query.edit_message_text(
-                message,
-                parse_mode='HTML',
-                reply_markup=get_notification_keyboard(chat_id)
-            )
-            return
 
-        elif callback_data == "reminder_settings":
-            message = """<b>⏰ 경기 알림 시간 설정</b>
+# ============ Data callbacks (fetch from the API, return message text) ============
+
+# The "all" message is chat-independent, so one global short-TTL cache
+# serves back-to-back /update and "전체 정보" requests from any user
+_ALL_MSG_CACHE = None
+_ALL_MSG_TTL = 30  # seconds
+
+
+async def _build_all_message(chat_id: str) -> str:
+    """Build the full match-information message (cached for a short TTL)"""
+    global _ALL_MSG_CACHE
+
+    now = time.monotonic()
+    if _ALL_MSG_CACHE and now - _ALL_MSG_CACHE[0] < _ALL_MSG_TTL:
+        return _ALL_MSG_CACHE[1]
+
+    notifier = get_notifier(chat_id)
+
+    # The five API calls are independent - run them concurrently so
+    # latency is roughly one round-trip instead of five
+    standing, all_standings, upcoming_raw, future_raw, recent_raw = await asyncio.gather(
+        asyncio.to_thread(api_client.get_team_standing),
+        asyncio.to_thread(api_client.get_all_standings),
+        asyncio.to_thread(api_client.get_upcoming_matches, 2),
+        asyncio.to_thread(api_client.get_upcoming_future_matches, 3),
+        asyncio.to_thread(api_client.get_recent_results, 5),
+    )
+    upcoming_matches = [api_client.format_match_info(m) for m in upcoming_raw]
+    future_matches = [api_client.format_match_info(m) for m in future_raw]
+    recent_results = [api_client.format_match_info(m) for m in recent_raw]
 
-경기 시작 몇 분 전에 알림을 받을지 선택하세요."""
-            await query.edit_message_text(
-                message,
-                parse_mode='HTML',
-                reply_markup=get_reminder_keyboard()
-            )
+    message = notifier.format_match_notification(
+        upcoming_matches, future_matches, recent_results, standing, all_standings
+    )
+    _ALL_MSG_CACHE = (now, message)
+    return message
+
+
+async def _build_future_message(chat_id: str) -> str:
+    """Build the future-matches message"""
+    notifier = get_notifier(chat_id)
+    standing, all_standings, future_raw = await asyncio.gather(
+        asyncio.to_thread(api_client.get_team_standing),
+        asyncio.to_thread(api_client.get_all_standings),
+        asyncio.to_thread(api_client.get_upcoming_future_matches, 5),
+    )
+    future_matches = [api_client.format_match_info(m) for m in future_raw]
+    return notifier.format_future_matches(future_matches, standing, all_standings)
+
+
+async def _build_recent_message(chat_id: str) -> str:
+    """Build the recent-results message"""
+    notifier = get_notifier(chat_id)
+    all_standings, recent_raw = await asyncio.gather(
+        asyncio.to_thread(api_client.get_all_standings),
+        asyncio.to_thread(api_client.get_recent_results, 5),
+    )
+    recent_results = [api_client.format_match_info(m) for m in recent_raw]
+    return notifier.format_recent_results(recent_results, all_standings)
+
+
+async def _build_standings_message(chat_id: str) -> str:
+    """Build the full league-table message"""
+    notifier = get_notifier(chat_id)
+    league_table = await asyncio.to_thread(api_client.get_league_table)
+    logger.debug("League table: %d teams", len(league_table))
+    return notifier.format_standings(league_table, BIRMINGHAM_TEAM_ID)
+
+
+# Dispatch tables: O(1) lookup instead of walking an if/elif chain on
+# every button press. Settings handlers edit the message themselves;
+# data handlers return the text to display.
+SETTINGS_HANDLERS = {
+    "main_menu": _show_main_menu,
+    "notifications": _show_notifications,
+    "toggle_morning": functools.partial(_toggle_notification, setting="morning_notification", label="아침 알림"),
+    "toggle_goal": functools.partial(_toggle_notification, setting="goal_notification", label="골 알림"),
+    "toggle_lineup": functools.partial(_toggle_notification, setting="lineup_notification", label="라인업 알림"),
+    "morning_hour_settings": _show_morning_hour_settings,
+    "reminder_settings": _show_reminder_settings,
+}
+
+# Callbacks carrying a numeric payload, e.g. "set_morning_hour_9"
+PREFIX_HANDLERS = (
+    ("set_morning_hour_", _set_morning_hour),
+    ("set_reminder_", _set_reminder),
+)
+
+DATA_HANDLERS = {
+    "all": _build_all_message,
+    "future": _build_future_message,
+    "recent": _build_recent_message,
+    "standings": _build_standings_message,
+}
+
+
+async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle button callbacks"""
+    query = update.callback_query
+
+    chat_id = str(update.effective_chat.id)
+    username = update.effective_user.username
+    callback_data = query.data
+    logger.info("Button pressed: %s from chat_id: %s", callback_data, chat_id)
+
+    # Ensure user exists
+    ensure_user(chat_id, username)
+
+    try:
+        # Notification settings callbacks (no API calls needed)
+        handler = SETTINGS_HANDLERS.get(callback_data)
+        if handler:
+            await handler(query, chat_id)
             return
 
-        elif callback_data.startswith("set_reminder_"):
-            minutes = int(callback_data.split("_")[2])
-            db.update_match_reminder(chat_id, minutes)
-            if minutes == 0:
-                status_text = "경기 알림이 꺼졌습니다."
-            else:
-                status_text = f"경기 시작 {minutes}분 전에 알림을 보내드립니다."
-            message = f"""<b>🔔 알림 설정</b>
-
-{status_text}"""
-            await query.edit_message_text(
-                message,
-                parse_mode='HTML',
-                reply_markup=get_notification_keyboard(chat_id)
-            )
+        for prefix, prefix_handler in PREFIX_HANDLERS:
+            if callback_data.startswith(prefix):
+                await prefix_handler(query, chat_id, int(callback_data[len(prefix):]))
+                return
+
+        builder = DATA_HANDLERS.get(callback_data)
+        if builder is None:
+            await query.answer()
+            await _safe_edit(query, MSG_UNKNOWN_COMMAND, reply_markup=MENU_KEYBOARD)
             return
 
-        # API calls for match data
-        await query.edit_message_text("⏳ 정보를 가져오는 중...")
-
-        notifier = TelegramNotifier(TELEGRAM_BOT_TOKEN, chat_id)
-        all_standings = api_client.get_all_standings()
-
-        if callback_data == "all":
-            # All information
-            standing = api_client.get_team_standing()
-            upcoming_raw = api_client.get_upcoming_matches(days_ahead=2)
-            upcoming_matches = [api_client.format_match_info(m) for m in upcoming_raw]
-            future_raw = api_client.get_upcoming_future_matches(limit=3)
-            future_matches = [api_client.format_match_info(m) for m in future_raw]
-            recent_raw = api_client.get_recent_results(limit=5)
-            recent_results = [api_client.format_match_info(m) for m in recent_raw]
-
-            message = notifier.format_match_notification(
-                upcoming_matches, future_matches, recent_results, standing, all_standings
-            )
-
-        elif callback_data == "future":
-            # Future matches only
-            standing = api_client.get_team_standing()
-            future_raw = api_client.get_upcoming_future_matches(limit=5)
-            future_matches = [api_client.format_match_info(m) for m in future_raw]
-            message = notifier.format_future_matches(future_matches, standing, all_standings)
-
-        elif callback_data == "recent":
-            # Recent results only
-            recent_raw = api_client.get_recent_results(limit=5)
-            recent_results = [api_client.format_match_info(m) for m in recent_raw]
-            message = notifier.format_recent_results(recent_results, all_standings)
-
-        elif callback_data == "standings":
-            # Full league table
-            league_table = api_client.get_league_table()
-            logger.info(f"League table: {len(league_table)} teams")
-            message = notifier.format_standings(league_table, BIRMINGHAM_TEAM_ID)
-
-        else:
-            message = "알 수 없는 명령입니다."
-
-        await query.edit_message_text(message, parse_mode='HTML', reply_markup=get_menu_keyboard())
+        # API calls for match data - serialized per chat so double-presses
+        # don't stack concurrent fetches
+        await query.answer()
+        async with _lock_for(chat_id):
+            await _safe_edit(query, MSG_LOADING)
+            message = await builder(chat_id)
+            await _safe_edit(query, message, parse_mode='HTML', reply_markup=MENU_KEYBOARD)
 
     except Exception as e:
-        logger.error(f"Error in button callback: {e}")
+        logger.error("Error in button callback: %s", e)
+        # Direct edit bypasses _safe_edit, so drop the tracked state
+        # rather than let it go stale
+        _last_render.pop(chat_id, None)
         await query.edit_message_text(
             f"⚠️ 오류가 발생했습니다: {str(e)}",
-            reply_markup=get_menu_keyboard()
+            reply_markup=MENU_KEYBOARD
         )
 
 
@@ -354,7 +479,7 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     """Handle /help command - show available commands"""
     chat_id = str(update.effective_chat.id)
     username = update.effective_user.username
-    db.get_or_create_user(chat_id, username)
+    ensure_user(chat_id, username)
 
     help_text = """⚽ <b>Birmingham City FC 봇</b>
 
@@ -370,20 +495,20 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 🏆 리그 순위표 - 현재 순위 상세
 🔔 알림 설정 - 알림 켜기/끄기"""
 
-    await update.message.reply_text(help_text, parse_mode='HTML', reply_markup=get_menu_keyboard())
+    await update.message.reply_text(help_text, parse_mode='HTML', reply_markup=MENU_KEYBOARD)
 
 
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /start command"""
     chat_id = str(update.effective_chat.id)
     username = update.effective_user.username
-    db.get_or_create_user(chat_id, username)
+    ensure_user(chat_id, username)
 
     start_text = """⚽ <b>Birmingham City FC 알리미</b>에 오신 것을 환영합니다!
 
 아래 버튼을 눌러 원하는 정보를 확인하세요."""
 
-    await update.message.reply_text(start_text, parse_mode='HTML', reply_markup=get_menu_keyboard())
+    await update.message.reply_text(start_text, parse_mode='HTML', reply_markup=MENU_KEYBOARD)
 
 
 async def restart_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -392,65 +517,97 @@ async def restart_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
     # Check if user is admin
     if chat_id != str(TELEGRAM_CHAT_ID):
-        logger.warning(f"Unauthorized /restart attempt from chat_id: {chat_id}")
-        await update.message.reply_text("⛔ 권한이 없습니다.", reply_markup=get_menu_keyboard())
+        logger.warning("Unauthorized /restart attempt from chat_id: %s", chat_id)
+        await update.message.reply_text("⛔ 권한이 없습니다.", reply_markup=MENU_KEYBOARD)
         return
 
-    logger.info(f"Restart command received from admin: {chat_id}")
+    logger.info("Restart command received from admin: %s", chat_id)
     await update.message.reply_text("🔄 봇을 업데이트하고 재시작합니다...")
 
     try:
-        # Create restart flag file with chat_id
-        with open(RESTART_FLAG_FILE, "w") as f:
-            f.write(chat_id)
-
-        # Run update.sh script
-        script_path = "/var/services/homes/admin/scripts/birmingham-city-notifier/update.sh"
-        subprocess.Popen(
-            ["bash", script_path],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            start_new_session=True
+        # Pull the latest code, awaited so we never exec stale sources
+        proc = await asyncio.create_subprocess_exec(
+            "git", "pull",
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+        )
+        output, _ = await proc.communicate()
+        logger.info("git pull: %s", output.decode().strip())
+
+        # Install any dependencies the pulled code added before exec'ing
+        # into it, or the restarted process dies on the first new import
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "pip", "install", "-r", "requirements.txt",
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
         )
-        logger.info("Update script started")
+        output, _ = await proc.communicate()
+        logger.info("pip install: %s", output.decode().strip())
+
+        # Stop background jobs cleanly before replacing the process
+        scheduler.stop()
+
+        # The chat to notify after restart travels in the environment,
+        # which is cheaper than probing the filesystem on every startup
+        os.environ[RESTART_NOTIFY_ENV] = chat_id
+
+        # Replace this process in place - atomic, keeps the PID, and
+        # leaves no window where two bot processes poll Telegram
+        os.execv(sys.executable, [sys.executable, os.path.abspath(__file__)])
     except Exception as e:
-        logger.error(f"Failed to run update script: {e}")
-        await update.message.reply_text(f"⚠️ 재시작 실패: {str(e)}", reply_markup=get_menu_keyboard())
+        logger.error("Failed to restart: %s", e)
+        await update.message.reply_text(f"⚠️ 재시작 실패: {str(e)}", reply_markup=MENU_KEYBOARD)
 
 
-async def send_restart_success_message():
+async def send_restart_success_message(app):
     """Send success message if bot was restarted via /restart command"""
-    if os.path.exists(RESTART_FLAG_FILE):
-        try:
-            with open(RESTART_FLAG_FILE, "r") as f:
-                chat_id = f.read().strip()
-
-            # Delete flag file
-            os.remove(RESTART_FLAG_FILE)
-
-            # Send success message
-            from telegram import Bot
-            bot = Bot(token=TELEGRAM_BOT_TOKEN)
-            await bot.send_message(
-                chat_id=chat_id,
-                text="✅ 봇이 성공적으로 업데이트되고 재시작되었습니다!",
-                reply_markup=get_menu_keyboard()
-            )
-            logger.info(f"Restart success message sent to {chat_id}")
-        except Exception as e:
-            logger.error(f"Failed to send restart success message: {e}")
+    # The pre-restart process leaves the chat to notify in our environment
+    chat_id = os.environ.pop(RESTART_NOTIFY_ENV, None)
+    if not chat_id:
+        return
+
+    try:
+        # Reuse the application's already-initialized bot instead of
+        # constructing a fresh Bot (and a fresh HTTP client) for one message
+        await app.bot.send_message(
+            chat_id=chat_id,
+            text="✅ 봇이 성공적으로 업데이트되고 재시작되었습니다!",
+            reply_markup=MENU_KEYBOARD
+        )
+        logger.info("Restart success message sent to %s", chat_id)
+    except Exception as e:
+        logger.error("Failed to send restart success message: %s", e)
+
+
+async def _post_init(app) -> None:
+    """Run once the application's event loop is up: start the notification
+    scheduler on it and announce a completed /restart if one happened"""
+    scheduler.start()
+    await send_restart_success_message(app)
 
 
 def main() -> None:
     """Start the bot"""
     print(f"[{datetime.now()}] Starting Birmingham City FC Telegram Bot Server...")
 
-    # Start the scheduler for notifications
-    scheduler.start()
-    print("Notification scheduler started")
-
-    application = Application.builder().token(TELEGRAM_BOT_TOKEN).post_init(
-        lambda app: send_restart_success_message()
+    # Use uvloop's libuv-backed event loop when available - faster socket
+    # I/O and task scheduling for the many small awaits per callback
+    try:
+        import uvloop
+        uvloop.install()
+        print("Using uvloop event loop")
+    except ImportError:
+        pass
+
+    # concurrent_updates lets handlers run as independent tasks instead
+    # of serializing every user behind one queue; per-chat locks above
+    # keep a single chat's API fetches from overlapping
+    application = Application.builder().token(TELEGRAM_BOT_TOKEN).concurrent_updates(
+        True
+    ).post_init(
+        _post_init
     ).build()
 
     # Add handlers
@@ -5,14 +5,61 @@ Uses SQLite for storing user preferences
 
 import sqlite3
 import os
+import queue
+import threading
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 from contextlib import contextmanager
 
 
+# Fixed SQL strings for the hot paths: handing sqlite3 the identical
+# string object every call lets its statement cache reuse the compiled
+# plan instead of re-parsing
+SQL_GET_USER = "SELECT * FROM users WHERE chat_id = ?"
+
+# Single-statement upsert: create the row, or refresh the username on an
+# existing one (keeping the old name when none was supplied), and hand
+# the full row back - no separate SELECT/UPDATE round-trips
+SQL_UPSERT_USER = """
+    INSERT INTO users (chat_id, username) VALUES (?, ?)
+    ON CONFLICT(chat_id) DO UPDATE
+    SET username = COALESCE(excluded.username, users.username)
+    RETURNING *
+"""
+
+# Columns a caller may update through update_settings
+_ALLOWED_COLUMNS = frozenset({
+    "morning_notification",
+    "morning_notification_hour",
+    "match_reminder_minutes",
+    "goal_notification",
+    "lineup_notification",
+})
+
+# One statement per toggleable column, so the f-string never rebuilds SQL.
+# 1 - col flips the bit in place and RETURNING hands back the new value,
+# making the whole toggle a single round-trip.
+SQL_TOGGLE = {
+    "morning_notification":
+        "UPDATE users SET morning_notification = 1 - morning_notification"
+        " WHERE chat_id = ? RETURNING morning_notification",
+    "goal_notification":
+        "UPDATE users SET goal_notification = 1 - goal_notification"
+        " WHERE chat_id = ? RETURNING goal_notification",
+    "lineup_notification":
+        "UPDATE users SET lineup_notification = 1 - lineup_notification"
+        " WHERE chat_id = ? RETURNING lineup_notification",
+}
+
+
 class Database:
     """SQLite database manager for the Birmingham bot"""
 
+    READ_POOL_SIZE = 4
+
+    # Bump when the DDL below changes so _init_tables re-runs once
+    SCHEMA_VERSION = 1
+
     def __init__(self, db_path: str = "data/birmingham.db"):
         """
         Initialize database connection
@@ -22,8 +69,30 @@ class Database:
         """
         self.db_path = db_path
         self._ensure_directory()
+
+        # One long-lived writer connection: opening per call re-parses the
+        # schema and throws away the page cache every time. check_same_thread
+        # is off because the scheduler threads share this instance; the RLock
+        # serializes writes instead.
+        self._conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, cached_statements=128
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+
         self._init_tables()
 
+        # Small pool of read-only connections: under WAL, readers don't
+        # block the writer or each other, so scheduler fan-out reads can
+        # proceed while a settings toggle commits
+        self._read_pool = queue.Queue()
+        for _ in range(self.READ_POOL_SIZE):
+            reader = sqlite3.connect(
+                self.db_path, check_same_thread=False, cached_statements=128
+            )
+            reader.row_factory = sqlite3.Row
+            self._read_pool.put(reader)
+
     def _ensure_directory(self):
         """Ensure the data directory exists"""
         dir_path = os.path.dirname(self.db_path)
@@ -31,24 +100,45 @@ class Database:
             os.makedirs(dir_path, exist_ok=True)
 
     @contextmanager
-    def _get_connection(self):
-        """Context manager for database connections"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+    def _get_connection(self, write: bool = True):
+        """Context manager yielding the writer (locked) or a pooled reader"""
+        if write:
+            with self._lock:
+                try:
+                    yield self._conn
+                    self._conn.commit()
+                except Exception:
+                    self._conn.rollback()
+                    raise
+        else:
+            conn = self._read_pool.get()
+            try:
+                yield conn
+            finally:
+                self._read_pool.put(conn)
 
     def _init_tables(self):
-        """Initialize database tables"""
+        """Initialize database tables (skipped when the schema is current)"""
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
+            # WAL lets scheduler reads proceed while a toggle writes, and
+            # NORMAL synchronous defers the per-statement fsync - safe in
+            # WAL mode. The rest sizes the page cache / mmap generously
+            # since this is the process's only database.
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.execute("PRAGMA mmap_size=268435456")
+            cursor.execute("PRAGMA cache_size=-64000")
+
+            # The DDL below is idempotent but still costs a schema check
+            # per statement; user_version lets an up-to-date database
+            # skip it entirely
+            version = cursor.execute("PRAGMA user_version").fetchone()[0]
+            if version >= self.SCHEMA_VERSION:
+                return
+
             # Users table with notification settings
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS users (
@@ -67,6 +157,26 @@ class Database:
             # Create index
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_chat_id ON users(chat_id)")
 
+            # Partial indexes turning the scheduler cohort queries into
+            # index seeks instead of full-table scans
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_users_morning
+                ON users(morning_notification, morning_notification_hour)
+                WHERE morning_notification = 1
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_users_goal
+                ON users(goal_notification)
+                WHERE goal_notification = 1
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_users_lineup
+                ON users(lineup_notification)
+                WHERE lineup_notification = 1
+            """)
+
+            cursor.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
     def get_or_create_user(self, chat_id: str, username: str = None) -> Dict[str, Any]:
         """
         Get existing user or create new one
@@ -80,150 +190,138 @@ class Database:
         """
         with self._get_connection() as conn:
             cursor = conn.cursor()
-
-            # Try to get existing user
-            cursor.execute("SELECT * FROM users WHERE chat_id = ?", (chat_id,))
-            user = cursor.fetchone()
-
-            if user:
-                # Update username if changed
-                if username and user["username"] != username:
-                    cursor.execute(
-                        "UPDATE users SET username = ? WHERE chat_id = ?",
-                        (username, chat_id)
-                    )
-                return dict(user)
-
-            # Create new user
-            cursor.execute(
-                "INSERT INTO users (chat_id, username) VALUES (?, ?)",
-                (chat_id, username)
-            )
-            cursor.execute("SELECT * FROM users WHERE chat_id = ?", (chat_id,))
+            cursor.execute(SQL_UPSERT_USER, (chat_id, username))
             return dict(cursor.fetchone())
 
     def get_user(self, chat_id: str) -> Optional[Dict[str, Any]]:
         """Get user by chat ID"""
-        with self._get_connection() as conn:
+        with self._get_connection(write=False) as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM users WHERE chat_id = ?", (chat_id,))
+            cursor.execute(SQL_GET_USER, (chat_id,))
             user = cursor.fetchone()
             return dict(user) if user else None
 
     def get_all_users(self) -> List[Dict[str, Any]]:
         """Get all users"""
-        with self._get_connection() as conn:
+        with self._get_connection(write=False) as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM users")
             return [dict(row) for row in cursor.fetchall()]
 
-    def update_morning_notification(self, chat_id: str, enabled: bool) -> bool:
-        """Enable/disable morning notifications for user"""
+    def update_settings(self, chat_id: str, **updates) -> bool:
+        """
+        Update one or more user settings in a single statement
+
+        Args:
+            chat_id: Telegram chat ID
+            **updates: column=value pairs, restricted to _ALLOWED_COLUMNS
+
+        Returns:
+            True if a row was updated
+        """
+        columns = [col for col in updates if col in _ALLOWED_COLUMNS]
+        if not columns:
+            return False
+
+        sql = (
+            "UPDATE users SET "
+            + ", ".join(f"{col} = ?" for col in columns)
+            + " WHERE chat_id = ?"
+        )
+        values = [updates[col] for col in columns]
+
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                "UPDATE users SET morning_notification = ? WHERE chat_id = ?",
-                (1 if enabled else 0, chat_id)
-            )
+            cursor.execute(sql, (*values, chat_id))
             return cursor.rowcount > 0
 
+    def update_morning_notification(self, chat_id: str, enabled: bool) -> bool:
+        """Enable/disable morning notifications for user"""
+        return self.update_settings(chat_id, morning_notification=1 if enabled else 0)
+
     def update_morning_notification_hour(self, chat_id: str, hour: int) -> bool:
         """Update morning notification hour for user"""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "UPDATE users SET morning_notification_hour = ? WHERE chat_id = ?",
-                (hour, chat_id)
-            )
-            return cursor.rowcount > 0
+        return self.update_settings(chat_id, morning_notification_hour=hour)
 
     def update_match_reminder(self, chat_id: str, minutes: int) -> bool:
         """Update match reminder time (minutes before match)"""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "UPDATE users SET match_reminder_minutes = ? WHERE chat_id = ?",
-                (minutes, chat_id)
-            )
-            return cursor.rowcount > 0
+        return self.update_settings(chat_id, match_reminder_minutes=minutes)
 
     def update_goal_notification(self, chat_id: str, enabled: bool) -> bool:
         """Enable/disable goal notifications for user"""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "UPDATE users SET goal_notification = ? WHERE chat_id = ?",
-                (1 if enabled else 0, chat_id)
-            )
-            return cursor.rowcount > 0
+        return self.update_settings(chat_id, goal_notification=1 if enabled else 0)
 
     def update_lineup_notification(self, chat_id: str, enabled: bool) -> bool:
         """Enable/disable lineup notifications for user"""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "UPDATE users SET lineup_notification = ? WHERE chat_id = ?",
-                (1 if enabled else 0, chat_id)
-            )
-            return cursor.rowcount > 0
+        return self.update_settings(chat_id, lineup_notification=1 if enabled else 0)
 
     def toggle_setting(self, chat_id: str, setting_name: str) -> bool:
         """Toggle a boolean setting and return new value"""
-        user = self.get_user(chat_id)
-        if not user:
+        sql = SQL_TOGGLE.get(setting_name)
+        if sql is None:
             return False
 
-        current = user.get(setting_name, 1)
-        new_value = 0 if current else 1
-
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                f"UPDATE users SET {setting_name} = ? WHERE chat_id = ?",
-                (new_value, chat_id)
-            )
+            cursor.execute(sql, (chat_id,))
+            row = cursor.fetchone()
 
-        return bool(new_value)
+        return bool(row[0]) if row else False
 
-    def get_users_for_morning_notification(self, hour: int) -> List[Dict[str, Any]]:
-        """Get all users with morning notification enabled at specific hour"""
-        with self._get_connection() as conn:
+    def get_users_for_morning_notification(self, hour: int) -> List[str]:
+        """Get chat IDs of users with morning notification enabled at specific hour"""
+        with self._get_connection(write=False) as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                SELECT * FROM users
+                SELECT chat_id FROM users
                 WHERE morning_notification = 1
                 AND morning_notification_hour = ?
             """, (hour,))
+            return [row["chat_id"] for row in cursor.fetchall()]
+
+    def get_users_for_match_reminder(self) -> List[Dict[str, Any]]:
+        """Get chat ID and reminder offset for users with reminders enabled"""
+        with self._get_connection(write=False) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT chat_id, match_reminder_minutes FROM users
+                WHERE match_reminder_minutes > 0
+            """)
             return [dict(row) for row in cursor.fetchall()]
 
-    def get_users_for_goal_notification(self) -> List[Dict[str, Any]]:
-        """Get all users with goal notification enabled"""
-        with self._get_connection() as conn:
+    def get_users_for_goal_notification(self) -> List[str]:
+        """Get chat IDs of users with goal notification enabled"""
+        with self._get_connection(write=False) as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                SELECT * FROM users
+                SELECT chat_id FROM users
                 WHERE goal_notification = 1
             """)
-            return [dict(row) for row in cursor.fetchall()]
+            return [row["chat_id"] for row in cursor.fetchall()]
 
-    def get_users_for_lineup_notification(self) -> List[Dict[str, Any]]:
-        """Get all users with lineup notification enabled"""
-        with self._get_connection() as conn:
+    def get_users_for_lineup_notification(self) -> List[str]:
+        """Get chat IDs of users with lineup notification enabled"""
+        with self._get_connection(write=False) as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                SELECT * FROM users
+                SELECT chat_id FROM users
                 WHERE lineup_notification = 1
             """)
-            return [dict(row) for row in cursor.fetchall()]
+            return [row["chat_id"] for row in cursor.fetchall()]
 
 
 # Singleton instance
 _db_instance: Optional[Database] = None
+_db_lock = threading.Lock()
 
 
 def get_database(db_path: str = "data/birmingham.db") -> Database:
-    """Get or create database instance"""
+    """Get or create database instance (thread-safe)"""
     global _db_instance
     if _db_instance is None:
-        _db_instance = Database(db_path)
+        # Double-checked: handlers can race here once the bot dispatches
+        # updates concurrently
+        with _db_lock:
+            if _db_instance is None:
+                _db_instance = Database(db_path)
     return _db_instance
@@ -6,6 +6,7 @@ Sends daily Telegram notifications about Birmingham City FC matches
 This script should be run daily (e.g., via cron) to send match updates
 """
 
+import asyncio
 import sys
 from datetime import datetime
 
@@ -25,8 +26,8 @@ from football_api import FootballAPIClient
 from telegram_bot import TelegramNotifier
 
 
-def main():
-    """Main function to fetch match data and send notifications"""
+async def main_async():
+    """Fetch match data and send notifications on one event loop"""
 
     print(f"[{datetime.now()}] Starting Birmingham City FC notifier...")
 
@@ -68,20 +69,19 @@ def main():
 
     except Exception as e:
         print(f"Error fetching match data: {e}")
-        # Send error notification
+        # Send error notification on the same loop
         try:
             error_message = f"⚠️ 버밍엄 시티 FC 경기 정보를 가져오는데 실패했습니다.\n\n오류: {str(e)}"
-            import asyncio
-            asyncio.run(telegram.send_message(error_message))
-        except:
-            pass
-        sys.exit(1)
+            await telegram.send_message(error_message)
+        except Exception as notify_err:
+            print(f"Failed to send error notification: {notify_err}", file=sys.stderr)
+        return 1
 
     # Send notification
     print("Sending Telegram notification...")
 
     try:
-        success = telegram.send_notification_sync(
+        success = await telegram.send_notification(
             upcoming_matches,
             future_matches,
             recent_results,
@@ -105,5 +105,5 @@ def main():
 
 
 if __name__ == "__main__":
-    exit_code = main()
+    exit_code = asyncio.run(main_async())
     sys.exit(exit_code)
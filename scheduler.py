@@ -5,16 +5,19 @@ Handles morning notifications, match reminders, live scores, and lineups
 
 import asyncio
 import logging
-from datetime import datetime, timedelta
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Any
 
-from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from telegram import Bot
+from telegram.error import RetryAfter
 
 from config import TELEGRAM_BOT_TOKEN, BIRMINGHAM_TEAM_ID
 from database import get_database
-from football_api import FootballAPIClient
+from football_api import CachingFootballAPIClient
 
 logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -23,23 +26,62 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Static message templates, built once at import; only the dynamic
+# fields are formatted per send
+TPL_REMINDER = (
+    "<b>⏰ 경기 시작 알림</b>\n\n"
+    "<b>Birmingham City</b> 경기가 %d분 후에 시작합니다!\n\n"
+    "🏟️ %s vs %s\n"
+    "📍 %s"
+)
+TPL_GOAL = (
+    "<b>%s 골!</b>\n\n"
+    "<b>%s</b> 득점!\n\n"
+    "🏟️ %s %d - %d %s"
+)
+TPL_MORNING_HEADER = "<b>⚽ 오늘의 버밍엄 시티 경기</b>\n<i>%s</i>\n"
+TPL_MORNING_MATCH = "⏰ %s\n   %s vs %s\n"
+TPL_LINEUP_HEADER = "<b>📋 선발 라인업</b>\n\n<b>%s vs %s</b>\n"
+TPL_LINEUP_TEAM = "\n<b>%s</b>"
+TPL_LINEUP_PLAYER = "  %s: %s"
+
+
+@dataclass(slots=True)
+class LiveScore:
+    """Last observed score of a live match (ts for age-based pruning)"""
+    home: int = 0
+    away: int = 0
+    ts: float = 0.0
+
+
 class NotificationScheduler:
     """Handles scheduled notifications for Birmingham City FC bot"""
 
     def __init__(self, api_key: str, db_path: str = "data/birmingham.db"):
         self.bot = Bot(token=TELEGRAM_BOT_TOKEN)
         self.db = get_database(db_path)
-        self.api = FootballAPIClient(api_key, BIRMINGHAM_TEAM_ID)
-        self.scheduler = BackgroundScheduler()
-        self._match_jobs = {}  # Track scheduled match reminder jobs
-        self._live_scores = {}  # Track live match scores for goal detection
-        self._lineup_sent = {}  # Track which lineups have been sent
+        self.api = CachingFootballAPIClient(api_key, BIRMINGHAM_TEAM_ID)
+        self.scheduler = AsyncIOScheduler()
+        # Tracking state, keyed by job/match id with the insertion time as
+        # value (or alongside it) so stale entries can be aged out - these
+        # would otherwise grow for every match ever seen
+        self._match_jobs = {}  # job_id -> monotonic time scheduled
+        self._live_scores = {}  # match_id -> LiveScore
+        self._lineup_sent = {}  # match_id -> monotonic time sent
+
+        # Next known kickoff (UTC), maintained by the reminder tick and
+        # used to skip live-score/lineup polling outside match windows
+        self._next_match_utc = None
+
+        # Token bucket for outbound sends (refilled in _acquire_tokens)
+        self._send_tokens = float(self.SEND_RATE_PER_SEC)
+        self._tokens_updated = time.monotonic()
 
     def start(self):
-        """Start the scheduler"""
+        """Start the scheduler (must be called with an event loop running)"""
         # Schedule morning notification - run every hour from 7 AM to 11 AM
         self.scheduler.add_job(
-            self._run_morning_notifications,
+            self.send_morning_notifications,
             CronTrigger(hour="7-11", minute=0),
             id="morning_notification",
             replace_existing=True
@@ -47,7 +89,7 @@ class NotificationScheduler:
 
         # Schedule match reminder check every 5 minutes
         self.scheduler.add_job(
-            self._run_match_reminder_check,
+            self.check_and_schedule_match_reminders,
             CronTrigger(minute="*/5"),
             id="match_reminder_check",
             replace_existing=True
@@ -55,7 +97,7 @@ class NotificationScheduler:
 
         # Schedule live score check every 3 minutes
         self.scheduler.add_job(
-            self._run_live_score_check,
+            self.check_live_scores,
             CronTrigger(minute="*/3"),
             id="live_score_check",
             replace_existing=True
@@ -63,7 +105,7 @@ class NotificationScheduler:
 
         # Schedule lineup check every 30 minutes
         self.scheduler.add_job(
-            self._run_lineup_check,
+            self.check_lineups,
             CronTrigger(minute="*/30"),
             id="lineup_check",
             replace_existing=True
@@ -72,48 +114,108 @@ class NotificationScheduler:
         self.scheduler.start()
         logger.info("Scheduler started. Morning: 7-11AM, Live score: every 3min, Lineup: every 30min")
 
-    def _run_morning_notifications(self):
-        """Sync wrapper for morning notifications"""
-        asyncio.run(self.send_morning_notifications())
-
-    def _run_match_reminder_check(self):
-        """Sync wrapper for match reminder check"""
-        asyncio.run(self.check_and_schedule_match_reminders())
-
-    def _run_live_score_check(self):
-        """Sync wrapper for live score check"""
-        asyncio.run(self.check_live_scores())
-
-    def _run_lineup_check(self):
-        """Sync wrapper for lineup check"""
-        asyncio.run(self.check_lineups())
-
     def stop(self):
         """Stop the scheduler"""
         self.scheduler.shutdown()
         logger.info("Scheduler stopped")
 
+    # Chats per concurrent send burst
+    BROADCAST_CHUNK_SIZE = 25
+
+    # Telegram's bot-wide sustained limit is ~30 messages/second
+    SEND_RATE_PER_SEC = 30
+
+    # Tracking entries older than this are dropped (seconds)
+    TRACKING_TTL = 86400
+
+    @staticmethod
+    def _prune_by_age(tracking: Dict, now: float, age=lambda v: v):
+        """Drop tracking entries older than TRACKING_TTL in place"""
+        cutoff = now - NotificationScheduler.TRACKING_TTL
+        stale = [key for key, value in tracking.items() if age(value) < cutoff]
+        for key in stale:
+            del tracking[key]
+
+    async def _acquire_tokens(self, count: int):
+        """Block until the token bucket holds enough for `count` sends"""
+        while True:
+            now = time.monotonic()
+            self._send_tokens = min(
+                float(self.SEND_RATE_PER_SEC),
+                self._send_tokens + (now - self._tokens_updated) * self.SEND_RATE_PER_SEC
+            )
+            self._tokens_updated = now
+
+            if self._send_tokens >= count:
+                self._send_tokens -= count
+                return
+
+            await asyncio.sleep((count - self._send_tokens) / self.SEND_RATE_PER_SEC)
+
+    async def _send_paced(self, chat_id: str, text: str):
+        """Send one message, honoring an explicit Telegram backoff once"""
+        try:
+            await self.bot.send_message(chat_id=chat_id, text=text, parse_mode='HTML')
+        except RetryAfter as e:
+            logger.warning("Rate limited by Telegram, retrying in %ss", e.retry_after)
+            await asyncio.sleep(e.retry_after)
+            await self.bot.send_message(chat_id=chat_id, text=text, parse_mode='HTML')
+
+    async def broadcast(self, chat_ids: List[str], text: str):
+        """
+        Send the same message to many chats
+
+        The text is formatted once by the caller; sends within a chunk run
+        concurrently and each chunk first draws from a token bucket that
+        refills at Telegram's sustained rate, so bursts never exceed the
+        limit. Failures are logged per chat and don't stop the rest of
+        the fan-out.
+        """
+        for i in range(0, len(chat_ids), self.BROADCAST_CHUNK_SIZE):
+            chunk = chat_ids[i:i + self.BROADCAST_CHUNK_SIZE]
+            await self._acquire_tokens(len(chunk))
+
+            results = await asyncio.gather(
+                *[self._send_paced(chat_id, text) for chat_id in chunk],
+                return_exceptions=True
+            )
+            for chat_id, result in zip(chunk, results):
+                if isinstance(result, Exception):
+                    logger.error("Failed to send broadcast to %s: %s", chat_id, result)
+
     async def send_morning_notifications(self):
         """Send morning notifications to users whose notification hour matches current time"""
         current_hour = datetime.now().hour
-        logger.info(f"Starting morning notification job for hour {current_hour}...")
+        logger.info("Starting morning notification job for hour %d...", current_hour)
 
-        users = self.db.get_users_for_morning_notification(hour=current_hour)
-        logger.info(f"Found {len(users)} users for morning notification at {current_hour}:00")
+        # The API client and SQLite are synchronous - run them in a worker
+        # thread so a slow tick can't stall the bot's own handlers
+        chat_ids = await asyncio.to_thread(
+            self.db.get_users_for_morning_notification, hour=current_hour
+        )
+        logger.info("Found %d users for morning notification at %d:00", len(chat_ids), current_hour)
+        if not chat_ids:
+            return
 
-        for user in users:
-            try:
-                await self._send_morning_notification_to_user(user)
-            except Exception as e:
-                logger.error(f"Failed to send morning notification to {user['chat_id']}: {e}")
+        # The content is identical for every user scheduled this hour -
+        # build it once and broadcast instead of re-fetching per user
+        today_matches = await asyncio.to_thread(self._get_todays_matches)
+        if not today_matches:
+            return
 
-    async def _send_morning_notification_to_user(self, user: Dict[str, Any]):
-        """Send morning notification to a single user"""
-        chat_id = user["chat_id"]
+        message = self._format_morning_message(today_matches)
+        await self.broadcast(chat_ids, message)
+        logger.info("Morning notification broadcast to %d users: %d matches",
+                    len(chat_ids), len(today_matches))
 
+    def _get_todays_matches(self) -> List[Dict]:
+        """Get today's matches (plus tomorrow's early-morning KST kickoffs)"""
+        # korea_time is "YYYY-MM-DD HH:MM"; comparing its ISO date/time
+        # slices directly avoids per-match strftime round-trips (the old
+        # MM/DD reformatting also never matched the ISO string)
         now = datetime.now()
-        today = now.strftime("%m/%d")
-        tomorrow = (now + timedelta(days=1)).strftime("%m/%d")
+        today = now.date().isoformat()
+        tomorrow = (now + timedelta(days=1)).date().isoformat()
         today_matches = []
 
         # Get Birmingham City matches
@@ -122,8 +224,8 @@ class NotificationScheduler:
         for match in matches:
             match_info = self.api.format_match_info(match)
             korea_time = match_info.get("korea_time", "")
-            match_date = korea_time[:5]  # MM/DD
-            match_time = korea_time[6:11] if len(korea_time) >= 11 else ""  # HH:MM
+            match_date = korea_time[:10]  # YYYY-MM-DD
+            match_time = korea_time[11:16]  # HH:MM
 
             # Include today's matches
             if match_date == today:
@@ -132,60 +234,54 @@ class NotificationScheduler:
             elif match_date == tomorrow and match_time < "09:00":
                 today_matches.append(match_info)
 
-        if today_matches:
-            message = self._format_morning_message(today_matches)
-            await self.bot.send_message(
-                chat_id=chat_id,
-                text=message,
-                parse_mode='HTML'
-            )
-            logger.info(f"Morning notification sent to {chat_id}: {len(today_matches)} matches")
+        return today_matches
 
     def _format_morning_message(self, matches: List[Dict]) -> str:
         """Format morning notification message"""
-        lines = [
-            f"<b>⚽ 오늘의 버밍엄 시티 경기</b>",
-            f"<i>{datetime.now().strftime('%Y년 %m월 %d일')}</i>\n"
-        ]
-
-        for match in matches:
-            home = match.get("home_team", "")
-            away = match.get("away_team", "")
-            korea_time = match.get("korea_time", "")
-
-            lines.append(f"⏰ {korea_time}")
-            lines.append(f"   {home} vs {away}\n")
-
-        lines.append("KRO! 💙")
-
-        return "\n".join(lines)
+        header = TPL_MORNING_HEADER % datetime.now().strftime('%Y년 %m월 %d일')
+        body = "".join(
+            TPL_MORNING_MATCH % (
+                match.get("korea_time", ""),
+                match.get("home_team", ""),
+                match.get("away_team", "")
+            ) + "\n"
+            for match in matches
+        )
+        return header + "\n" + body + "KRO! 💙"
 
     async def check_and_schedule_match_reminders(self):
         """Check for upcoming matches and schedule reminders"""
         logger.debug("Checking for matches to schedule reminders...")
 
-        users = self.db.get_all_users()
+        self._prune_by_age(self._match_jobs, time.monotonic())
+
+        # One cached fetch per tick; this also keeps the next-kickoff
+        # marker fresh for the live-score and lineup window guards.
+        # The requests-backed client blocks, so keep it off the loop.
+        matches = await asyncio.to_thread(self.api.get_upcoming_matches, days_ahead=1)
+        self._update_next_match(matches)
+        if not matches:
+            return
+
+        # Let SQLite materialize the cohort column-wise instead of
+        # scanning every user dict in Python
+        users = await asyncio.to_thread(self.db.get_users_for_match_reminder)
+        if not users:
+            return
 
         for user in users:
             try:
-                await self._schedule_reminders_for_user(user)
+                await self._schedule_reminders_for_user(user, matches)
             except Exception as e:
-                logger.error(f"Failed to schedule reminders for {user['chat_id']}: {e}")
+                logger.error("Failed to schedule reminders for %s: %s", user['chat_id'], e)
 
-    async def _schedule_reminders_for_user(self, user: Dict[str, Any]):
+    async def _schedule_reminders_for_user(self, user: Dict[str, Any], matches: List[Dict]):
         """Schedule match reminders for a single user"""
         chat_id = user["chat_id"]
         reminder_minutes = user.get("match_reminder_minutes", 30)
 
-        if reminder_minutes <= 0:
-            return
-
-        matches = self.api.get_upcoming_matches(days_ahead=1)
-
         for match in matches:
-            match_info = self.api.format_match_info(match)
             match_id = match.get("id")
-
             if not match_id:
                 continue
 
@@ -195,10 +291,17 @@ class NotificationScheduler:
             if job_id in self._match_jobs:
                 continue
 
-            # Calculate reminder time
+            # Check the reminder window on the cheap parsed timestamp
+            # before paying for format_match_info - most matches in the
+            # list fall outside it. The parse is stashed on the match
+            # dict since the cached client hands back the same dicts
+            # across ticks.
             try:
-                utc_time = match.get("utcDate", "")
-                match_datetime = datetime.fromisoformat(utc_time.replace("Z", "+00:00"))
+                match_datetime = match.get("_parsed_utc")
+                if match_datetime is None:
+                    utc_time = match.get("utcDate", "")
+                    match_datetime = datetime.fromisoformat(utc_time.replace("Z", "+00:00"))
+                    match["_parsed_utc"] = match_datetime
 
                 # Convert to local time and calculate reminder time
                 reminder_time = match_datetime - timedelta(minutes=reminder_minutes)
@@ -206,22 +309,19 @@ class NotificationScheduler:
 
                 # Only schedule if reminder time is in the future and within 2 hours
                 if now < reminder_time < now + timedelta(hours=2):
+                    match_info = self.api.format_match_info(match)
                     self.scheduler.add_job(
-                        self._run_send_match_reminder,
+                        self._send_match_reminder,
                         'date',
                         run_date=reminder_time,
                         args=[chat_id, match_info, reminder_minutes],
                         id=job_id
                     )
-                    self._match_jobs[job_id] = True
-                    logger.info(f"Scheduled reminder for {chat_id}: {job_id} at {reminder_time}")
+                    self._match_jobs[job_id] = time.monotonic()
+                    logger.info("Scheduled reminder for %s: %s at %s", chat_id, job_id, reminder_time)
 
             except Exception as e:
-                logger.error(f"Failed to parse match time: {e}")
-
-    def _run_send_match_reminder(self, chat_id: str, match_info: Dict, minutes: int):
-        """Sync wrapper for sending match reminder"""
-        asyncio.run(self._send_match_reminder(chat_id, match_info, minutes))
+                logger.error("Failed to parse match time: %s", e)
 
     async def _send_match_reminder(self, chat_id: str, match_info: Dict, minutes: int):
         """Send match start reminder"""
@@ -230,67 +330,98 @@ class NotificationScheduler:
             away = match_info.get("away_team", "")
             korea_time = match_info.get("korea_time", "")
 
-            message = (
-                f"<b>⏰ 경기 시작 알림</b>\n\n"
-                f"<b>Birmingham City</b> 경기가 {minutes}분 후에 시작합니다!\n\n"
-                f"🏟️ {home} vs {away}\n"
-                f"📍 {korea_time}"
-            )
+            message = TPL_REMINDER % (minutes, home, away, korea_time)
 
             await self.bot.send_message(
                 chat_id=chat_id,
                 text=message,
                 parse_mode='HTML'
             )
-            logger.info(f"Match reminder sent to {chat_id}")
+            logger.info("Match reminder sent to %s", chat_id)
 
         except Exception as e:
-            logger.error(f"Failed to send match reminder to {chat_id}: {e}")
+            logger.error("Failed to send match reminder to %s: %s", chat_id, e)
+
+    def _update_next_match(self, matches: List[Dict]):
+        """Remember the earliest upcoming kickoff for the window guards"""
+        kickoffs = [m["utcDate"] for m in matches if m.get("utcDate")]
+        if kickoffs:
+            earliest = min(kickoffs)
+            self._next_match_utc = datetime.fromisoformat(
+                earliest.replace("Z", "+00:00")
+            )
+
+    def _in_match_window(self, lead: timedelta) -> bool:
+        """Whether now is within `lead` before the next kickoff (or 3h after)"""
+        if self._next_match_utc is None:
+            return False
+        now = datetime.now(timezone.utc)
+        return (self._next_match_utc - lead) <= now <= (self._next_match_utc + timedelta(hours=3))
 
     # ============ Live Score Notifications ============
 
     async def check_live_scores(self):
         """Check for live matches and detect goals"""
+        # Outside a match window there is nothing live to poll - skip the
+        # API call and DB query entirely (~480 ticks/day otherwise)
+        if not self._in_match_window(lead=timedelta(minutes=5)):
+            return
+
         try:
-            # Get all users with goal notification enabled
-            users = self.db.get_users_for_goal_notification()
-            if not users:
+            self._prune_by_age(self._live_scores, time.monotonic(),
+                               age=lambda v: v.ts)
+
+            # Check for live matches first: most 3-minute ticks find none,
+            # so the user-table scan is skipped entirely
+            live_matches = await asyncio.to_thread(self.api.get_live_matches)
+            if not live_matches:
                 return
 
-            # Get live matches for Birmingham
-            live_matches = self.api.get_live_matches()
+            # One cohort query shared by every live match this tick
+            chat_ids = await asyncio.to_thread(self.db.get_users_for_goal_notification)
+            if not chat_ids:
+                return
 
-            for match in live_matches:
-                await self._process_live_match(match, users)
+            # Matches are independent - process them concurrently; the
+            # token-bucket broadcast keeps the combined sends under the
+            # Telegram rate cap
+            results = await asyncio.gather(
+                *[self._process_live_match(match, chat_ids) for match in live_matches],
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error("Error processing live match: %s", result)
 
         except Exception as e:
-            logger.error(f"Error checking live scores: {e}")
+            logger.error("Error checking live scores: %s", e)
 
-    async def _process_live_match(self, match: Dict, users: List[Dict]):
+    async def _process_live_match(self, match: Dict, chat_ids: List[str]):
         """Process a live match for goal detection"""
         match_id = match.get("id")
         if not match_id:
             return
 
-        home_team = match.get("homeTeam", {})
-        away_team = match.get("awayTeam", {})
-        home_id = home_team.get("id")
-        away_id = away_team.get("id")
-        home_name = home_team.get("name", "")
-        away_name = away_team.get("name", "")
-
         score = match.get("score", {}).get("fullTime", {})
         home_score = score.get("home", 0) or 0
         away_score = score.get("away", 0) or 0
 
         # Get previous score
-        prev_score = self._live_scores.get(match_id, {"home": 0, "away": 0})
-        prev_home = prev_score.get("home", 0)
-        prev_away = prev_score.get("away", 0)
+        prev_score = self._live_scores.get(match_id) or LiveScore()
+        prev_home = prev_score.home
+        prev_away = prev_score.away
 
         # Detect goal
         if home_score > prev_home or away_score > prev_away:
-            # Goal detected!
+            # Goal detected! Only now dig the team names and ids out of
+            # the payload - the common no-goal tick skips these lookups
+            home_team = match.get("homeTeam", {})
+            away_team = match.get("awayTeam", {})
+            home_id = home_team.get("id")
+            away_id = away_team.get("id")
+            home_name = home_team.get("name", "")
+            away_name = away_team.get("name", "")
+
             if home_score > prev_home:
                 scoring_team = home_name
                 scoring_team_id = home_id
@@ -300,61 +431,57 @@ class NotificationScheduler:
 
             is_birmingham_goal = scoring_team_id == BIRMINGHAM_TEAM_ID
 
-            # Notify all users with goal notification enabled
-            for user in users:
-                await self._send_goal_notification(
-                    user["chat_id"],
-                    home_name, away_name,
-                    home_score, away_score,
-                    scoring_team,
-                    is_birmingham_goal
-                )
-
-        # Update stored score
-        self._live_scores[match_id] = {"home": home_score, "away": away_score}
-
-    async def _send_goal_notification(self, chat_id: str,
-                                      home_name: str, away_name: str,
-                                      home_score: int, away_score: int,
-                                      scoring_team: str, is_birmingham_goal: bool):
-        """Send goal notification to user"""
-        try:
+            # Format the message once and broadcast it to every user with
+            # goal notifications enabled
             emoji = "🎉" if is_birmingham_goal else "⚽"
-            message = (
-                f"<b>{emoji} 골!</b>\n\n"
-                f"<b>{scoring_team}</b> 득점!\n\n"
-                f"🏟️ {home_name} {home_score} - {away_score} {away_name}"
+            message = TPL_GOAL % (
+                emoji, scoring_team, home_name, home_score, away_score, away_name
             )
-
-            await self.bot.send_message(
-                chat_id=chat_id,
-                text=message,
-                parse_mode='HTML'
+            await self.broadcast(chat_ids, message)
+            logger.info("Goal notification broadcast to %d users", len(chat_ids))
+
+        # Update stored score; drop tracking once the match finishes
+        if match.get("status") == "FINISHED":
+            self._live_scores.pop(match_id, None)
+            self._lineup_sent.pop(match_id, None)
+        else:
+            self._live_scores[match_id] = LiveScore(
+                home_score, away_score, time.monotonic()
             )
-            logger.info(f"Goal notification sent to {chat_id}")
-
-        except Exception as e:
-            logger.error(f"Failed to send goal notification to {chat_id}: {e}")
 
     # ============ Lineup Notifications ============
 
     async def check_lineups(self):
         """Check for upcoming match lineups"""
+        # Lineups appear roughly an hour before kickoff; outside that
+        # window the tick has nothing to find
+        if not self._in_match_window(lead=timedelta(minutes=75)):
+            return
+
         try:
-            users = self.db.get_users_for_lineup_notification()
-            if not users:
+            self._prune_by_age(self._lineup_sent, time.monotonic())
+
+            # Most days have no fixture - look for one before scanning users
+            today_matches = await asyncio.to_thread(self.api.get_today_matches)
+            if not today_matches:
                 return
 
-            # Get today's matches
-            today_matches = self.api.get_today_matches()
+            chat_ids = await asyncio.to_thread(self.db.get_users_for_lineup_notification)
+            if not chat_ids:
+                return
 
-            for match in today_matches:
-                await self._process_lineup(match, users)
+            results = await asyncio.gather(
+                *[self._process_lineup(match, chat_ids) for match in today_matches],
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error("Error processing lineup: %s", result)
 
         except Exception as e:
-            logger.error(f"Error checking lineups: {e}")
+            logger.error("Error checking lineups: %s", e)
 
-    async def _process_lineup(self, match: Dict, users: List[Dict]):
+    async def _process_lineup(self, match: Dict, chat_ids: List[str]):
         """Process a match for lineup notification"""
         match_id = match.get("id")
         status = match.get("status")
@@ -382,8 +509,8 @@ class NotificationScheduler:
         except Exception:
             return
 
-        # Get match details with lineups
-        match_details = self.api.get_match_details(match_id)
+        # Get match details with lineups (blocking fetch, off the loop)
+        match_details = await asyncio.to_thread(self.api.get_match_details, match_id)
         if not match_details:
             return
 
@@ -394,54 +521,38 @@ class NotificationScheduler:
         if not home_lineup and not away_lineup:
             return
 
-        # Notify all users with lineup notification enabled
-        for user in users:
-            await self._send_lineup_notification(user["chat_id"], match_details)
+        # Format once and broadcast to all users with lineup notifications
+        message = self._format_lineup_message(match_details)
+        await self.broadcast(chat_ids, message)
+        logger.info("Lineup notification broadcast to %d users", len(chat_ids))
 
         # Mark as sent
-        self._lineup_sent[match_id] = True
-
-    async def _send_lineup_notification(self, chat_id: str, match_details: Dict):
-        """Send lineup notification to user"""
-        try:
-            home_team = match_details.get("homeTeam", {})
-            away_team = match_details.get("awayTeam", {})
-            home_name = home_team.get("name", "")
-            away_name = away_team.get("name", "")
+        self._lineup_sent[match_id] = time.monotonic()
 
-            home_lineup = home_team.get("lineup", [])
-            away_lineup = away_team.get("lineup", [])
+    @staticmethod
+    def _format_lineup_message(match_details: Dict) -> str:
+        """Format the starting lineup message for a match"""
+        home_team = match_details.get("homeTeam", {})
+        away_team = match_details.get("awayTeam", {})
+        home_name = home_team.get("name", "")
+        away_name = away_team.get("name", "")
 
-            lines = [
-                f"<b>📋 선발 라인업</b>\n",
-                f"<b>{home_name} vs {away_name}</b>\n"
-            ]
+        home_lineup = home_team.get("lineup", [])
+        away_lineup = away_team.get("lineup", [])
 
-            if home_lineup:
-                lines.append(f"\n<b>{home_name}</b>")
-                for player in home_lineup[:11]:
-                    name = player.get("name", "")
-                    position = player.get("position", "")
-                    lines.append(f"  {position}: {name}")
+        lines = [TPL_LINEUP_HEADER % (home_name, away_name)]
 
-            if away_lineup:
-                lines.append(f"\n<b>{away_name}</b>")
-                for player in away_lineup[:11]:
-                    name = player.get("name", "")
-                    position = player.get("position", "")
-                    lines.append(f"  {position}: {name}")
+        if home_lineup:
+            lines.append(TPL_LINEUP_TEAM % home_name)
+            for player in home_lineup[:11]:
+                lines.append(TPL_LINEUP_PLAYER % (player.get("position", ""), player.get("name", "")))
 
-            message = "\n".join(lines)
+        if away_lineup:
+            lines.append(TPL_LINEUP_TEAM % away_name)
+            for player in away_lineup[:11]:
+                lines.append(TPL_LINEUP_PLAYER % (player.get("position", ""), player.get("name", "")))
 
-            await self.bot.send_message(
-                chat_id=chat_id,
-                text=message,
-                parse_mode='HTML'
-            )
-            logger.info(f"Lineup notification sent to {chat_id}")
-
-        except Exception as e:
-            logger.error(f"Failed to send lineup notification to {chat_id}: {e}")
+        return "\n".join(lines)
 
 
 # Singleton instance
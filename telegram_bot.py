@@ -2,26 +2,190 @@
 Telegram Bot module for sending Birmingham City FC match notifications
 """
 
+from __future__ import annotations
+
 import asyncio
-from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup
-from telegram.error import TelegramError
-from typing import List, Dict, Optional
+import hashlib
+import html
+import json
+from collections import defaultdict
+from functools import lru_cache
+import requests
 from datetime import datetime
 
+# python-telegram-bot (and its httpx dependency graph) is imported lazily
+# on first network use, so callers that only render messages - tests,
+# dry runs - pay no import cost for it
+
+
+# Per-match block templates, built once at import: each match renders with
+# a single %-substitution and each section collapses to one join instead
+# of a handful of list.append calls per row
+TPL_UPCOMING_BLOCK = "🇰🇷 한국: %s / 🇬🇧 영국: %s\n%s vs %s%s\n"
+TPL_FUTURE_BLOCK = "🇰🇷 %s / 🇬🇧 %s\nvs %s%s %s %s\n"
+TPL_RESULT_BLOCK = "🇰🇷 %s / 🇬🇧 %s\n%s\n"
+
+# Standing summary line (46 = Championship season length), substituted in
+# one format_map call over the standing dict
+TPL_STANDING_LINE = (
+    "📊 <b>리그 순위:</b> {position}위 | 총 46경기 중 {played}경기 "
+    "({remaining_games}경기 남음) | {won}승 {draw}무 {lost}패 | {points}점 "
+    "(득실차 {gd_sign}{goal_difference}) | {playoff_msg}"
+)
+
+# One Bot per token, shared by every notifier instance: repeat
+# instantiations (tests, reloads) reuse the warmed HTTPX connection pool
+# instead of paying a fresh TLS handshake on their first send
+_BOT_POOL: dict[str, "Bot"] = {}
+
+
+def _get_bot(bot_token: str) -> "Bot":
+    """Get or create the shared Bot for a token"""
+    bot = _BOT_POOL.get(bot_token)
+    if bot is None:
+        from telegram import Bot
+        from telegram.request import HTTPXRequest
+
+        bot = _BOT_POOL.setdefault(bot_token, Bot(
+            token=bot_token,
+            request=HTTPXRequest(connection_pool_size=4, http_version="1.1"),
+        ))
+    return bot
+
+
+# One limiter per token, shared by every notifier instance: Telegram's
+# ~30 msg/s cap applies to the bot as a whole, so per-instance limiters
+# would multiply the budget by the number of chats sending concurrently
+_LIMITER_POOL: dict[str, "AsyncLimiter"] = {}
+
+
+def _get_limiter(bot_token: str) -> "AsyncLimiter":
+    """Get or create the shared AsyncLimiter for a token"""
+    limiter = _LIMITER_POOL.get(bot_token)
+    if limiter is None:
+        from aiolimiter import AsyncLimiter
+
+        limiter = _LIMITER_POOL.setdefault(bot_token, AsyncLimiter(30, 1))
+    return limiter
+
+
+# Fields the renderers read from a match dict, with their defaults.
+# Filled in once per match at the render boundary so the per-field
+# .get(..., default) calls disappear from the hot loops.
+_MATCH_DEFAULTS = {
+    "home_team": "Unknown",
+    "away_team": "Unknown",
+    "korea_time": "Unknown",
+    "uk_time": "Unknown",
+    "venue": "Unknown",
+    "home_team_id": None,
+    "away_team_id": None,
+    "home_score": 0,
+    "away_score": 0,
+}
+
+
+def _normalize_match(match: dict) -> dict:
+    """Fill missing match fields in place so renderers can index directly"""
+    for key in _MATCH_DEFAULTS.keys() - match.keys():
+        match[key] = _MATCH_DEFAULTS[key]
+    return match
+
+
+# Team names come through in either Korean or English depending on the
+# data source, so the "is this Birmingham" check probes both aliases
+BIRMINGHAM_ALIASES = ("버밍엄", "Birmingham")
+
+
+def _is_birmingham(name: str) -> bool:
+    """True when the given team name refers to Birmingham City"""
+    return any(alias in name for alias in BIRMINGHAM_ALIASES)
+
+
+WEEKDAYS_KR = ["월", "화", "수", "목", "금", "토", "일"]
+
+# Header date string, recomputed at most once per calendar day: strftime
+# is surprisingly costly and every formatter stamps the same date
+_TODAY_CACHE = (0, "")
+
+
+def _today_str() -> str:
+    """Today as "YYYY-MM-DD(요일)", cached per calendar day"""
+    global _TODAY_CACHE
+    now = datetime.now()
+    day = now.toordinal()
+    if day != _TODAY_CACHE[0]:
+        _TODAY_CACHE = (day, f"{now.date().isoformat()}({WEEKDAYS_KR[now.weekday()]})")
+    return _TODAY_CACHE[1]
+
+
+@lru_cache(maxsize=256)
+def _format_datetime_with_weekday(datetime_str: str) -> str:
+    """Format datetime string with Korean weekday: MM-DD(요일) HH:MM
+
+    Cached: the same kickoff timestamps recur across sections and across
+    renders, and strptime/strftime are the expensive part of each row.
+    """
+    try:
+        dt = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M")
+        weekday = WEEKDAYS_KR[dt.weekday()]
+        return dt.strftime(f"%m-%d({weekday}) %H:%M")
+    except:
+        return datetime_str[5:] if len(datetime_str) > 5 else datetime_str
+
+
+def _d_day_future(korea_time: str) -> str:
+    """D-day label for an upcoming match: "D-3", "D-Day", or empty"""
+    try:
+        match_date = datetime.strptime(korea_time[:10], "%Y-%m-%d").date()
+        days_left = (match_date - datetime.now().date()).days
+        if days_left == 0:
+            return "D-Day"
+        if days_left > 0:
+            return f"D-{days_left}"
+        return ""
+    except:
+        return ""
+
+
+def _d_day_past(korea_time: str) -> str:
+    """D+day label for a finished match: "D+3" or "D-Day" """
+    try:
+        match_date = datetime.strptime(korea_time[:10], "%Y-%m-%d").date()
+        days_ago = (datetime.now().date() - match_date).days
+        return f"D+{days_ago}" if days_ago > 0 else "D-Day"
+    except:
+        return ""
+
+
+# Outcome text keyed on (Birmingham at home, sign of home_score - away_score),
+# precomputed so deciding 승/무/패 is one comparison pair and one dict lookup
+_RESULT_TABLE = {
+    (True, 1): "승 ✅", (True, -1): "패 💀", (True, 0): "무 🤝",
+    (False, 1): "패 💀", (False, -1): "승 ✅", (False, 0): "무 🤝",
+}
+
+
+def _result_text(is_home: bool, is_away: bool, home_score: int, away_score: int) -> str:
+    """Match outcome from Birmingham's perspective (승/무/패 with emoji)"""
+    if not (is_home or is_away):
+        return ""
+    sign = (home_score > away_score) - (home_score < away_score)
+    return _RESULT_TABLE[(is_home, sign)]
+
 
 class TelegramNotifier:
     """Telegram bot for sending match notifications"""
 
-    WEEKDAYS_KR = ["월", "화", "수", "목", "금", "토", "일"]
+    WEEKDAYS_KR = WEEKDAYS_KR
 
-    def _format_datetime_with_weekday(self, datetime_str: str) -> str:
-        """Format datetime string with Korean weekday: MM-DD(요일) HH:MM"""
-        try:
-            dt = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M")
-            weekday = self.WEEKDAYS_KR[dt.weekday()]
-            return dt.strftime(f"%m-%d({weekday}) %H:%M")
-        except:
-            return datetime_str[5:] if len(datetime_str) > 5 else datetime_str
+    # Entries kept in the rendered-notification memo before the oldest is
+    # evicted (FIFO) - a handful of distinct renders exist per day at most
+    _FMT_CACHE_SIZE = 8
+
+    # Kept as an attribute for existing call sites; the cached module
+    # function does the work
+    _format_datetime_with_weekday = staticmethod(_format_datetime_with_weekday)
 
     def __init__(self, bot_token: str, chat_id: str):
         """
@@ -33,22 +197,48 @@ class TelegramNotifier:
         """
         self.bot_token = bot_token
         self.chat_id = chat_id
-        self.bot = Bot(token=bot_token)
-
-    @staticmethod
-    def get_menu_keyboard() -> InlineKeyboardMarkup:
-        """Create inline keyboard with menu buttons"""
-        keyboard = [
-            [InlineKeyboardButton("📋 전체 정보", callback_data="all")],
-            [
-                InlineKeyboardButton("📆 향후 경기", callback_data="future"),
-                InlineKeyboardButton("📊 최근 결과", callback_data="recent")
-            ],
-            [InlineKeyboardButton("🏆 리그 순위표", callback_data="standings")]
-        ]
-        return InlineKeyboardMarkup(keyboard)
-
-    async def send_message(self, message: str, reply_markup: Optional[InlineKeyboardMarkup] = None) -> bool:
+        # Shared per-token Bot, created on first use so construction
+        # doesn't import the network stack
+        self._bot = None
+        # Rendered-notification memo: the formatter is pure in its inputs,
+        # and scheduler ticks often re-render identical match data
+        self._fmt_cache: dict[bytes, str] = {}
+        # Messages queued via queue_notification, sent batched by flush
+        self._pending: list[str] = []
+        # Client-side pacing under Telegram's documented 30 msg/s global
+        # limit - shared per token like the Bot, bound on first send
+        self._limiter = None
+
+    @property
+    def bot(self) -> "Bot":
+        """Shared per-token Bot: its HTTPX client (and TLS connection to
+        api.telegram.org) survives across sends and notifier instances"""
+        if self._bot is None:
+            self._bot = _get_bot(self.bot_token)
+        return self._bot
+
+    # Built once on first use - the menu never changes, so every
+    # notification reuses the same markup object. Deferred from class
+    # creation so render-only callers never import python-telegram-bot.
+    _menu_keyboard = None
+
+    @classmethod
+    def get_menu_keyboard(cls) -> "InlineKeyboardMarkup":
+        """Inline keyboard with menu buttons"""
+        if cls._menu_keyboard is None:
+            from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+            cls._menu_keyboard = InlineKeyboardMarkup([
+                [InlineKeyboardButton("📋 전체 정보", callback_data="all")],
+                [
+                    InlineKeyboardButton("📆 향후 경기", callback_data="future"),
+                    InlineKeyboardButton("📊 최근 결과", callback_data="recent")
+                ],
+                [InlineKeyboardButton("🏆 리그 순위표", callback_data="standings")]
+            ])
+        return cls._menu_keyboard
+
+    async def send_message(self, message: str, reply_markup: "InlineKeyboardMarkup | None" = None) -> bool:
         """
         Send a message to the configured chat
 
@@ -59,25 +249,151 @@ class TelegramNotifier:
         Returns:
             True if message was sent successfully, False otherwise
         """
+        from telegram.error import RetryAfter, TelegramError
+
+        if self._limiter is None:
+            self._limiter = _get_limiter(self.bot_token)
+
+        # Skip server-side HTML parsing for plain-text messages
+        parse_mode = 'HTML' if '<' in message else None
+
         try:
-            await self.bot.send_message(
-                chat_id=self.chat_id,
-                text=message,
-                parse_mode='HTML',
-                reply_markup=reply_markup
-            )
+            async with self._limiter:
+                await self.bot.send_message(
+                    chat_id=self.chat_id,
+                    text=message,
+                    parse_mode=parse_mode,
+                    reply_markup=reply_markup
+                )
             return True
+        except RetryAfter as e:
+            # Server-side flood control: honor the advertised delay and
+            # retry once
+            await asyncio.sleep(e.retry_after)
+            try:
+                async with self._limiter:
+                    await self.bot.send_message(
+                        chat_id=self.chat_id,
+                        text=message,
+                        parse_mode=parse_mode,
+                        reply_markup=reply_markup
+                    )
+                return True
+            except TelegramError as retry_err:
+                print(f"Failed to send Telegram message after retry: {retry_err}")
+                return False
         except TelegramError as e:
             print(f"Failed to send Telegram message: {e}")
             return False
 
+    # Batched sends: separator between queued notifications and the pack
+    # limit, kept under Telegram's 4096-char cap to leave headroom for
+    # HTML tags
+    BATCH_SEPARATOR = "\n\n———\n\n"
+    BATCH_CHAR_LIMIT = 4000
+
+    def queue_notification(self, message: str) -> None:
+        """Queue a rendered message to be sent on the next flush"""
+        self._pending.append(message)
+
+    async def flush(self) -> bool:
+        """
+        Send all queued notifications in as few messages as possible
+
+        Queued messages are greedily packed (separator included) into
+        chunks under BATCH_CHAR_LIMIT, so N back-to-back notifications
+        usually cost a single sendMessage call. Splitting only happens on
+        the separator boundaries, never inside a message or an HTML tag.
+
+        Returns:
+            True if every chunk was sent successfully
+        """
+        if not self._pending:
+            return True
+
+        chunks = []
+        current = ""
+        for message in self._pending:
+            candidate = current + self.BATCH_SEPARATOR + message if current else message
+            if current and len(candidate) > self.BATCH_CHAR_LIMIT:
+                chunks.append(current)
+                current = message
+            else:
+                current = candidate
+        chunks.append(current)
+        self._pending.clear()
+
+        success = True
+        for chunk in chunks:
+            success = await self.send_message(chunk) and success
+        return success
+
+    def _render_future_block(self, match: dict, all_standings: dict[int, int]) -> str:
+        """Render one upcoming-fixture block (opponent, ranking, D-day)"""
+        _normalize_match(match)
+        home = match["home_team"]
+        away = match["away_team"]
+        korea_time = match["korea_time"]
+        uk_time = match["uk_time"]
+
+        # Determine if Birmingham is home or away
+        is_home = _is_birmingham(home)
+        location = "(홈)" if is_home else "(원정)"
+        opponent = away if is_home else home
+        opponent_id = match["away_team_id"] if is_home else match["home_team_id"]
+
+        # Get opponent ranking
+        opponent_rank = all_standings.get(opponent_id, 0)
+        rank_str = f" (리그 {opponent_rank}위)" if opponent_rank > 0 else ""
+
+        return TPL_FUTURE_BLOCK % (
+            self._format_datetime_with_weekday(korea_time),
+            self._format_datetime_with_weekday(uk_time),
+            html.escape(opponent, quote=False), rank_str, location, _d_day_future(korea_time),
+        )
+
+    def _render_result_block(self, match: dict, all_standings: dict[int, int]):
+        """Render one finished-match block; also returns the 승/무/패 text"""
+        _normalize_match(match)
+        home = match["home_team"]
+        away = match["away_team"]
+        korea_time = match["korea_time"]
+        uk_time = match["uk_time"]
+        home_score = match["home_score"]
+        away_score = match["away_score"]
+
+        is_home = _is_birmingham(home)
+        is_away = _is_birmingham(away)
+
+        opponent_id = match["away_team_id"] if is_home else match["home_team_id"]
+        opponent_rank = all_standings.get(opponent_id, 0)
+        rank_str = f"({opponent_rank}위)" if opponent_rank > 0 else ""
+
+        result_text = _result_text(is_home, is_away, home_score, away_score)
+        d_day = _d_day_past(korea_time)
+        home = html.escape(home, quote=False)
+        away = html.escape(away, quote=False)
+
+        # Format with opponent ranking
+        if is_home:
+            display_line = f"{home} {home_score} - {away_score} {away}{rank_str} {result_text} {d_day}"
+        else:
+            display_line = f"{home}{rank_str} {home_score} - {away_score} {away} {result_text} {d_day}"
+
+        block = TPL_RESULT_BLOCK % (
+            self._format_datetime_with_weekday(korea_time),
+            self._format_datetime_with_weekday(uk_time),
+            display_line,
+        )
+        return block, result_text
+
     def format_match_notification(
         self,
-        upcoming_matches: List[Dict],
-        future_matches: List[Dict],
-        recent_results: List[Dict],
-        standing: Dict = None,
-        all_standings: Dict[int, int] = None,
+        upcoming_matches: list[dict],
+        future_matches: list[dict],
+        recent_results: list[dict],
+        standing: dict = None,
+        all_standings: dict[int, int] = None,
         team_name: str = "Birmingham City FC"
     ) -> str:
         """
@@ -96,182 +412,102 @@ class TelegramNotifier:
         """
         if all_standings is None:
             all_standings = {}
-        now = datetime.now()
-        weekday = self.WEEKDAYS_KR[now.weekday()]
-        today = now.strftime(f"%Y-%m-%d({weekday})")
+        today = _today_str()
+
+        # The output is a pure function of the inputs and the calendar day
+        # (header date, D-day counts) - fingerprint both and reuse the
+        # rendered string when nothing has changed since the last call
+        cache_key = hashlib.blake2b(
+            json.dumps(
+                [today, upcoming_matches, future_matches, recent_results,
+                 standing, sorted(all_standings.items()), team_name],
+                sort_keys=True, default=str,
+            ).encode(),
+            digest_size=16,
+        ).digest()
+        cached = self._fmt_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         message_parts = [f"⚽ <b>{team_name} 경기 일정</b> ({today})\n"]
 
         # Add league standing if available
         if standing:
-            position = standing.get("position", 0)
-            played = standing.get("played", 0)
-            won = standing.get("won", 0)
-            draw = standing.get("draw", 0)
-            lost = standing.get("lost", 0)
-            points = standing.get("points", 0)
-            goal_diff = standing.get("goal_difference", 0)
-            gd_sign = "+" if goal_diff > 0 else ""
-            total_games = 46  # Championship has 46 games total
-            remaining_games = total_games - played
-            points_to_playoff = standing.get("points_to_playoff", 0)
-
-            # Format playoff message
-            if position <= 6:
-                playoff_msg = "⭐ 플레이오프권 내"
+            # defaultdict replaces the per-field .get(..., 0) fallbacks;
+            # the derived fields are added on top before one format_map
+            fields = defaultdict(int, standing)
+            fields["remaining_games"] = 46 - fields["played"]
+            fields["gd_sign"] = "+" if fields["goal_difference"] > 0 else ""
+            if fields["position"] <= 6:
+                fields["playoff_msg"] = "⭐ 플레이오프권 내"
             else:
-                playoff_msg = f"⭐ PO(6위)까지 {points_to_playoff}점 필요"
+                fields["playoff_msg"] = f"⭐ PO(6위)까지 {fields['points_to_playoff']}점 필요"
 
-            message_parts.append(f"📊 <b>리그 순위:</b> {position}위 | 총 {total_games}경기 중 {played}경기 ({remaining_games}경기 남음) | {won}승 {draw}무 {lost}패 | {points}점 (득실차 {gd_sign}{goal_diff}) | {playoff_msg}")
+            message_parts.append(TPL_STANDING_LINE.format_map(fields))
             message_parts.append("")
 
         # 1. Upcoming matches (today/tomorrow)
         message_parts.append("📅 <b>오늘/내일 경기:</b>")
         if upcoming_matches:
+            blocks = []
             for match in upcoming_matches:
-                home = match.get("home_team", "Unknown")
-                away = match.get("away_team", "Unknown")
-                korea_time = match.get("korea_time", "Unknown")
-                uk_time = match.get("uk_time", "Unknown")
-                venue = match.get("venue", "Unknown")
-
-                # Format time with weekday
-                korea_time_short = self._format_datetime_with_weekday(korea_time)
-                uk_time_short = self._format_datetime_with_weekday(uk_time)
-
-                message_parts.append(f"🇰🇷 한국: {korea_time_short} / 🇬🇧 영국: {uk_time_short}")
-                message_parts.append(f"{home} vs {away}")
-                if venue != "Unknown":
-                    message_parts.append(f"장소: {venue}")
-                message_parts.append("")
+                _normalize_match(match)
+                home = match["home_team"]
+                away = match["away_team"]
+                korea_time = match["korea_time"]
+                uk_time = match["uk_time"]
+                venue = match["venue"]
+
+                venue_part = f"\n장소: {html.escape(venue, quote=False)}" if venue != "Unknown" else ""
+                blocks.append(TPL_UPCOMING_BLOCK % (
+                    self._format_datetime_with_weekday(korea_time),
+                    self._format_datetime_with_weekday(uk_time),
+                    html.escape(home, quote=False), html.escape(away, quote=False), venue_part,
+                ))
+            message_parts.append("\n".join(blocks))
         else:
             message_parts.append("오늘/내일 예정된 경기가 없습니다.\n")
 
         # 2. Future matches (next 3 matches)
         if future_matches:
             message_parts.append("📆 <b>다음 경기 일정 (향후 3경기):</b>")
-            for match in future_matches:
-                home = match.get("home_team", "Unknown")
-                away = match.get("away_team", "Unknown")
-                home_team_id = match.get("home_team_id")
-                away_team_id = match.get("away_team_id")
-                korea_time = match.get("korea_time", "Unknown")
-                uk_time = match.get("uk_time", "Unknown")
-
-                # Determine if Birmingham is home or away
-                is_home = "버밍엄" in home or "Birmingham" in home
-                location = "(홈)" if is_home else "(원정)"
-                opponent = away if is_home else home
-                opponent_id = away_team_id if is_home else home_team_id
-
-                # Get opponent ranking
-                opponent_rank = all_standings.get(opponent_id, 0)
-                rank_str = f" (리그 {opponent_rank}위)" if opponent_rank > 0 else ""
-
-                # Calculate D-day
-                try:
-                    match_date = datetime.strptime(korea_time[:10], "%Y-%m-%d").date()
-                    today = datetime.now().date()
-                    days_left = (match_date - today).days
-                    if days_left == 0:
-                        d_day = "D-Day"
-                    elif days_left > 0:
-                        d_day = f"D-{days_left}"
-                    else:
-                        d_day = ""
-                except:
-                    d_day = ""
-
-                # Format time with weekday
-                korea_time_short = self._format_datetime_with_weekday(korea_time)
-                uk_time_short = self._format_datetime_with_weekday(uk_time)
-
-                message_parts.append(f"🇰🇷 {korea_time_short} / 🇬🇧 {uk_time_short}")
-                message_parts.append(f"vs {opponent}{rank_str} {location} {d_day}")
-                message_parts.append("")
+            message_parts.append("\n".join(
+                self._render_future_block(match, all_standings)
+                for match in future_matches
+            ))
 
         # 4. Recent results (last 5 games)
         if recent_results:
             message_parts.append("📊 <b>최근 경기 결과 (최근 5경기):</b>")
-            for match in recent_results:
-                home = match.get("home_team", "Unknown")
-                away = match.get("away_team", "Unknown")
-                home_team_id = match.get("home_team_id")
-                away_team_id = match.get("away_team_id")
-                korea_time = match.get("korea_time", "Unknown")
-                uk_time = match.get("uk_time", "Unknown")
-                home_score = match.get("home_score", 0)
-                away_score = match.get("away_score", 0)
-
-                # Determine if Birmingham won, lost, or drew
-                is_home = "버밍엄" in home or "Birmingham" in home
-                is_away = "버밍엄" in away or "Birmingham" in away
-
-                # Get opponent ranking
-                opponent_id = away_team_id if is_home else home_team_id
-                opponent_rank = all_standings.get(opponent_id, 0)
-                rank_str = f"({opponent_rank}위)" if opponent_rank > 0 else ""
-
-                if is_home:
-                    if home_score > away_score:
-                        result_text = "승 ✅"
-                    elif home_score < away_score:
-                        result_text = "패 💀"
-                    else:
-                        result_text = "무 🤝"
-                elif is_away:
-                    if away_score > home_score:
-                        result_text = "승 ✅"
-                    elif away_score < home_score:
-                        result_text = "패 💀"
-                    else:
-                        result_text = "무 🤝"
-                else:
-                    result_text = ""
-
-                # Calculate D+day (days since match)
-                try:
-                    match_date = datetime.strptime(korea_time[:10], "%Y-%m-%d").date()
-                    today = datetime.now().date()
-                    days_ago = (today - match_date).days
-                    d_day = f"D+{days_ago}" if days_ago > 0 else "D-Day"
-                except:
-                    d_day = ""
-
-                # Format time with weekday
-                korea_time_short = self._format_datetime_with_weekday(korea_time)
-                uk_time_short = self._format_datetime_with_weekday(uk_time)
-
-                # Format with opponent ranking
-                if is_home:
-                    display_line = f"{home} {home_score} - {away_score} {away}{rank_str} {result_text} {d_day}"
-                else:
-                    display_line = f"{home}{rank_str} {home_score} - {away_score} {away} {result_text} {d_day}"
-
-                message_parts.append(f"🇰🇷 {korea_time_short} / 🇬🇧 {uk_time_short}")
-                message_parts.append(display_line)
-                message_parts.append("")
+            message_parts.append("\n".join(
+                self._render_result_block(match, all_standings)[0]
+                for match in recent_results
+            ))
 
         # If absolutely no matches at all
-        if not upcoming_matches and not future_matches and not recent_results:
+        if not (upcoming_matches or future_matches or recent_results):
             message_parts.append("\n현재 예정된 경기 및 최근 결과가 없습니다.")
             message_parts.append("다음 경기 일정을 기다려주세요.")
 
-        return "\n".join(message_parts)
+        message = "\n".join(message_parts)
+
+        # Small FIFO cap: only a handful of distinct renders exist per day
+        if len(self._fmt_cache) >= self._FMT_CACHE_SIZE:
+            self._fmt_cache.pop(next(iter(self._fmt_cache)))
+        self._fmt_cache[cache_key] = message
+        return message
 
     def format_future_matches(
         self,
-        future_matches: List[Dict],
-        standing: Dict = None,
-        all_standings: Dict[int, int] = None
+        future_matches: list[dict],
+        standing: dict = None,
+        all_standings: dict[int, int] = None
     ) -> str:
         """Format future matches only"""
         if all_standings is None:
             all_standings = {}
 
-        now = datetime.now()
-        weekday = self.WEEKDAYS_KR[now.weekday()]
-        today_str = now.strftime(f"%Y-%m-%d({weekday})")
-        message_parts = [f"📆 <b>향후 경기 일정</b> ({today_str})\n"]
+        message_parts = [f"📆 <b>향후 경기 일정</b> ({_today_str()})\n"]
 
         # Add current standing summary
         if standing:
@@ -280,41 +516,10 @@ class TelegramNotifier:
             message_parts.append(f"현재 순위: {position}위 ({points}점)\n")
 
         if future_matches:
-            for match in future_matches:
-                home = match.get("home_team", "Unknown")
-                away = match.get("away_team", "Unknown")
-                home_team_id = match.get("home_team_id")
-                away_team_id = match.get("away_team_id")
-                korea_time = match.get("korea_time", "Unknown")
-                uk_time = match.get("uk_time", "Unknown")
-
-                is_home = "버밍엄" in home or "Birmingham" in home
-                location = "(홈)" if is_home else "(원정)"
-                opponent = away if is_home else home
-                opponent_id = away_team_id if is_home else home_team_id
-
-                opponent_rank = all_standings.get(opponent_id, 0)
-                rank_str = f" (리그 {opponent_rank}위)" if opponent_rank > 0 else ""
-
-                try:
-                    match_date = datetime.strptime(korea_time[:10], "%Y-%m-%d").date()
-                    today = datetime.now().date()
-                    days_left = (match_date - today).days
-                    if days_left == 0:
-                        d_day = "D-Day"
-                    elif days_left > 0:
-                        d_day = f"D-{days_left}"
-                    else:
-                        d_day = ""
-                except:
-                    d_day = ""
-
-                korea_time_short = self._format_datetime_with_weekday(korea_time)
-                uk_time_short = self._format_datetime_with_weekday(uk_time)
-
-                message_parts.append(f"🇰🇷 {korea_time_short} / 🇬🇧 {uk_time_short}")
-                message_parts.append(f"vs {opponent}{rank_str} {location} {d_day}")
-                message_parts.append("")
+            message_parts.append("\n".join(
+                self._render_future_block(match, all_standings)
+                for match in future_matches
+            ))
         else:
             message_parts.append("예정된 경기가 없습니다.")
 
@@ -322,80 +527,28 @@ class TelegramNotifier:
 
     def format_recent_results(
         self,
-        recent_results: List[Dict],
-        all_standings: Dict[int, int] = None
+        recent_results: list[dict],
+        all_standings: dict[int, int] = None
     ) -> str:
         """Format recent results only"""
         if all_standings is None:
             all_standings = {}
 
-        now = datetime.now()
-        weekday = self.WEEKDAYS_KR[now.weekday()]
-        today_str = now.strftime(f"%Y-%m-%d({weekday})")
-        message_parts = [f"📊 <b>최근 경기 결과</b> ({today_str})\n"]
+        message_parts = [f"📊 <b>최근 경기 결과</b> ({_today_str()})\n"]
 
         if recent_results:
             wins = draws = losses = 0
+            blocks = []
             for match in recent_results:
-                home = match.get("home_team", "Unknown")
-                away = match.get("away_team", "Unknown")
-                home_team_id = match.get("home_team_id")
-                away_team_id = match.get("away_team_id")
-                korea_time = match.get("korea_time", "Unknown")
-                uk_time = match.get("uk_time", "Unknown")
-                home_score = match.get("home_score", 0)
-                away_score = match.get("away_score", 0)
-
-                is_home = "버밍엄" in home or "Birmingham" in home
-                is_away = "버밍엄" in away or "Birmingham" in away
-
-                opponent_id = away_team_id if is_home else home_team_id
-                opponent_rank = all_standings.get(opponent_id, 0)
-                rank_str = f"({opponent_rank}위)" if opponent_rank > 0 else ""
-
-                if is_home:
-                    if home_score > away_score:
-                        result_text = "승 ✅"
-                        wins += 1
-                    elif home_score < away_score:
-                        result_text = "패 💀"
-                        losses += 1
-                    else:
-                        result_text = "무 🤝"
-                        draws += 1
-                elif is_away:
-                    if away_score > home_score:
-                        result_text = "승 ✅"
-                        wins += 1
-                    elif away_score < home_score:
-                        result_text = "패 💀"
-                        losses += 1
-                    else:
-                        result_text = "무 🤝"
-                        draws += 1
-                else:
-                    result_text = ""
-
-                # Calculate D+day (days since match)
-                try:
-                    match_date = datetime.strptime(korea_time[:10], "%Y-%m-%d").date()
-                    today = datetime.now().date()
-                    days_ago = (today - match_date).days
-                    d_day = f"D+{days_ago}" if days_ago > 0 else "D-Day"
-                except:
-                    d_day = ""
-
-                korea_time_short = self._format_datetime_with_weekday(korea_time)
-                uk_time_short = self._format_datetime_with_weekday(uk_time)
-
-                if is_home:
-                    display_line = f"{home} {home_score} - {away_score} {away}{rank_str} {result_text} {d_day}"
-                else:
-                    display_line = f"{home}{rank_str} {home_score} - {away_score} {away} {result_text} {d_day}"
-
-                message_parts.append(f"🇰🇷 {korea_time_short} / 🇬🇧 {uk_time_short}")
-                message_parts.append(display_line)
-                message_parts.append("")
+                block, result_text = self._render_result_block(match, all_standings)
+                blocks.append(block)
+                if result_text.startswith("승"):
+                    wins += 1
+                elif result_text.startswith("패"):
+                    losses += 1
+                elif result_text.startswith("무"):
+                    draws += 1
+            message_parts.append("\n".join(blocks))
 
             # Add summary
             message_parts.append(f"<b>최근 {len(recent_results)}경기:</b> {wins}승 {draws}무 {losses}패")
@@ -404,18 +557,14 @@ class TelegramNotifier:
 
         return "\n".join(message_parts)
 
-    def format_standings(self, league_table: List[Dict] = None, team_id: int = 332) -> str:
+    def format_standings(self, league_table: list[dict] = None, team_id: int = 332) -> str:
         """Format full league table"""
-        now = datetime.now()
-        weekday = self.WEEKDAYS_KR[now.weekday()]
-        today_str = now.strftime(f"%Y-%m-%d({weekday})")
-        message_parts = [f"🏆 <b>EFL Championship 순위표</b>\n({today_str})\n"]
+        message_parts = [f"🏆 <b>EFL Championship 순위표</b>\n({_today_str()})\n"]
 
         if league_table:
-            message_parts.append("<pre>")
-            message_parts.append("순위 | 팀 | 경기 | 승점")
-            message_parts.append("─" * 25)
-
+            # Build the table body in one buffer and append it as a single
+            # part instead of one list entry per row
+            rows = []
             for team in league_table:
                 pos = team.get("position", 0)
                 name = team.get("team_name", "Unknown")
@@ -423,43 +572,44 @@ class TelegramNotifier:
                 points = team.get("points", 0)
                 tid = team.get("team_id")
 
-                # Shorten team name
+                # Shorten team name, then escape for the HTML <pre> block
                 if len(name) > 12:
                     name = name[:11] + "."
+                name = html.escape(name, quote=False)
 
                 # Highlight Birmingham
                 if tid == team_id:
-                    line = f"<b>{pos:2d}  | {name:12s} | {played:2d} | {points:2d}</b> ⚽"
+                    rows.append(f"<b>{pos:2d}  | {name:12s} | {played:2d} | {points:2d}</b> ⚽")
                 # Highlight promotion/playoff zones
                 elif pos <= 2:
-                    line = f"{pos:2d}  | {name:12s} | {played:2d} | {points:2d} 🏆"
+                    rows.append(f"{pos:2d}  | {name:12s} | {played:2d} | {points:2d} 🏆")
                 elif pos <= 6:
-                    line = f"{pos:2d}  | {name:12s} | {played:2d} | {points:2d} ⭐"
+                    rows.append(f"{pos:2d}  | {name:12s} | {played:2d} | {points:2d} ⭐")
                 elif pos >= 22:
-                    line = f"{pos:2d}  | {name:12s} | {played:2d} | {points:2d} ⬇️"
+                    rows.append(f"{pos:2d}  | {name:12s} | {played:2d} | {points:2d} ⬇️")
                 else:
-                    line = f"{pos:2d}  | {name:12s} | {played:2d} | {points:2d}"
+                    rows.append(f"{pos:2d}  | {name:12s} | {played:2d} | {points:2d}")
 
-                message_parts.append(line)
-
-            message_parts.append("</pre>")
-            message_parts.append("")
-            message_parts.append("🏆 자동승격 | ⭐ 플레이오프 | ⬇️ 강등권")
+            message_parts.append(
+                "<pre>\n순위 | 팀 | 경기 | 승점\n" + "─" * 25 + "\n"
+                + "\n".join(rows)
+                + "\n</pre>\n\n🏆 자동승격 | ⭐ 플레이오프 | ⬇️ 강등권"
+            )
         else:
             message_parts.append("순위표를 가져올 수 없습니다.")
 
         return "\n".join(message_parts)
 
-    def send_notification_sync(
+    async def send_notification(
         self,
-        upcoming_matches: List[Dict],
-        future_matches: List[Dict],
-        recent_results: List[Dict],
-        standing: Dict = None,
-        all_standings: Dict[int, int] = None
+        upcoming_matches: list[dict],
+        future_matches: list[dict],
+        recent_results: list[dict],
+        standing: dict = None,
+        all_standings: dict[int, int] = None
     ) -> bool:
         """
-        Synchronous wrapper for sending match notifications
+        Format and send the full match notification
 
         Args:
             upcoming_matches: List of upcoming matches
@@ -479,8 +629,35 @@ class TelegramNotifier:
             all_standings
         )
 
-        # Run async function in sync context with menu keyboard
-        return asyncio.run(self.send_message(message, self.get_menu_keyboard()))
+        return await self.send_message(message, self.get_menu_keyboard())
+
+    def _send_message_sync(self, message: str, reply_markup: "InlineKeyboardMarkup | None" = None) -> bool:
+        """Send a message with one plain HTTPS POST - no event loop needed"""
+        payload = {"chat_id": self.chat_id, "text": message}
+        if "<" in message:
+            payload["parse_mode"] = "HTML"
+        if reply_markup is not None:
+            payload["reply_markup"] = reply_markup.to_json()
+        try:
+            response = requests.post(
+                f"https://api.telegram.org/bot{self.bot_token}/sendMessage",
+                json=payload,
+                timeout=10,
+            )
+            return response.ok
+        except requests.RequestException as e:
+            print(f"Failed to send Telegram message: {e}")
+            return False
+
+    def send_notification_sync(self, *args, **kwargs) -> bool:
+        """
+        Synchronous send for callers without a running loop
+
+        Goes straight to the Bot API with requests.post instead of
+        spinning up asyncio and an httpx client for a single message.
+        """
+        message = self.format_match_notification(*args, **kwargs)
+        return self._send_message_sync(message, self.get_menu_keyboard())
 
 
 # Test the Telegram bot when run directly